@@ -0,0 +1,85 @@
+import json
+import sqlite3
+from datetime import datetime
+
+from helper import getVariable
+from scrim_classes import Scrim, ScrimFormat, Team
+
+DATABASE_FILE: str = getVariable("DATABASE_FILE")
+
+class BotState:
+    """
+    Persists what CryoBot is tracking to DATABASE_FILE so a restart picks up where it left off instead of reposting everything
+
+    Scrims are saved by kind (current, played, incoming, outgoing) along with the id of the discord message posted for them
+    """
+    def __init__(self, path: str=DATABASE_FILE):
+        self._path: str = path
+        self._connection: sqlite3.Connection = None
+
+    def _connect(self) -> sqlite3.Connection:
+        """Opens the database if it hasn't been yet"""
+        if not self._connection:
+            self._connection = sqlite3.connect(self._path)
+            self._connection.execute("CREATE TABLE IF NOT EXISTS scrims (kind TEXT NOT NULL, time TEXT NOT NULL, format TEXT NOT NULL, team_number INTEGER, "
+                                     "team_name TEXT, open INTEGER NOT NULL, gankster_id INTEGER NOT NULL, message_id INTEGER)")
+            self._connection.execute("CREATE TABLE IF NOT EXISTS bot_values (name TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        return self._connection
+
+    def save_scrims(self, kind: str, scrims: list[tuple[Scrim, int]]) -> None:
+        """
+        Replaces every saved scrim of the given kind
+
+        Args:
+            kind (str): What the scrims are being tracked as (current, played, incoming, outgoing)
+            scrims (list[tuple[Scrim, int]]): The scrims and their discord message ids, None if no message
+
+        Returns:
+            None
+        """
+        connection = self._connect()
+        with connection:
+            connection.execute("DELETE FROM scrims WHERE kind = ?", (kind,))
+            connection.executemany("INSERT INTO scrims VALUES (?, ?, ?, ?, ?, ?, ?, ?)", [
+                (kind, scrim.time.isoformat(), scrim.scrim_format.name, scrim.team.number if scrim.team else None, scrim.team.name if scrim.team else None,
+                 scrim.open, scrim.gankster_id, message_id) for scrim, message_id in scrims])
+
+    def load_scrims(self, kind: str) -> list[tuple[Scrim, int]]:
+        """
+        Loads every saved scrim of the given kind
+
+        Args:
+            kind (str): What the scrims were being tracked as (current, played, incoming, outgoing)
+
+        Returns:
+            list[tuple[Scrim, int]]: The scrims, with only their team's number and name, and their discord message ids
+        """
+        rows = self._connect().execute("SELECT time, format, team_number, team_name, open, gankster_id, message_id FROM scrims WHERE kind = ?", (kind,))
+        return [(Scrim(datetime.fromisoformat(time), ScrimFormat[scrim_format], None if team_number is None and team_name is None else Team(number=team_number or 0, name=team_name or ""),
+                       bool(open), gankster_id), message_id) for time, scrim_format, team_number, team_name, open, gankster_id, message_id in rows]
+
+    def set_value(self, name: str, value) -> None:
+        """
+        Saves a json serializable value under the given name
+
+        Args:
+            name (str): The name to save the value under
+            value: The json serializable value to save
+
+        Returns:
+            None
+        """
+        connection = self._connect()
+        with connection:
+            connection.execute("INSERT OR REPLACE INTO bot_values VALUES (?, ?)", (name, json.dumps(value)))
+
+    def get_value(self, name: str, default=None):
+        """Gets the value saved under the given name, or default if nothing was saved"""
+        row = self._connect().execute("SELECT value FROM bot_values WHERE name = ?", (name,)).fetchone()
+        return default if row is None else json.loads(row[0])
+
+    def close(self) -> None:
+        """Closes the database connection, it will be reopened if the state is used again"""
+        if self._connection:
+            self._connection.close()
+            self._connection = None
@@ -0,0 +1,65 @@
+import time
+from collections import OrderedDict
+from typing import Any, Hashable
+
+class TTLCache:
+    """
+    In memory cache where entries expire after ttl seconds and the least recently used entry is evicted once maxsize is reached
+    """
+    def __init__(self, maxsize: int, ttl: float):
+        self._maxsize: int = maxsize
+        self._ttl: float = ttl
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+
+    def get(self, key: Hashable, default: Any=None) -> Any:
+        """
+        Gets the value for the given key if it's present and hasn't expired
+
+        Args:
+            key (Hashable): The key to look up
+            default (Any): What to return if the key is missing or expired
+
+        Returns:
+            Any: The cached value or default
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return default
+        expires, value = entry
+        if expires <= time.monotonic():
+            del self._entries[key]
+            return default
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: float=None) -> None:
+        """
+        Caches the value for the given key, evicting the least recently used entry if full
+
+        Args:
+            key (Hashable): The key to cache the value under
+            value (Any): The value to cache
+            ttl (float): How many seconds the value is valid for, the cache's ttl if not given
+
+        Returns:
+            None
+        """
+        self._entries[key] = (time.monotonic() + (self._ttl if ttl is None else ttl), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._maxsize:
+            self._entries.popitem(last=False)
+
+    def pop(self, key: Hashable, default: Any=None) -> Any:
+        """Removes the given key from the cache and returns its value, or default if it wasn't cached"""
+        entry = self._entries.pop(key, None)
+        return default if entry is None else entry[1]
+
+    def clear(self) -> None:
+        """Removes everything from the cache"""
+        self._entries.clear()
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key, self) is not self
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,46 @@
+import asyncio
+from typing import Awaitable, Callable
+
+class Coalescer:
+    """
+    Runs an async function so only one run happens at a time
+
+    Triggering while a run is in progress waits on a single follow-up run instead of starting another,
+    so a burst of triggers results in at most one extra run that starts after everything they changed
+    """
+    def __init__(self, func: Callable[[], Awaitable[None]]):
+        self._func = func
+        self._running: asyncio.Task = None
+        self._follow_up: asyncio.Task = None
+
+    async def trigger(self) -> None:
+        """
+        Runs the function, or waits on the follow-up run if it's already running
+
+        Returns:
+            None
+
+        Raises:
+            Exception: Whatever the run being waited on raised
+        """
+        # A pending follow-up takes over once the run before it finishes, so it has to be checked before whether anything is running
+        if self._follow_up and not self._follow_up.done():
+            await asyncio.shield(self._follow_up)
+            return
+        if not self._running or self._running.done():
+            self._running = asyncio.create_task(self._func())
+            await asyncio.shield(self._running)
+            return
+        self._follow_up = asyncio.create_task(self._run_after(self._running))
+        await asyncio.shield(self._follow_up)
+
+    async def _run_after(self, previous: asyncio.Task) -> None:
+        """Waits for the previous run to finish then becomes the running run"""
+        await asyncio.wait([previous])
+        self._running = self._follow_up
+        self._follow_up = None
+        await self._func()
+
+    def is_running(self) -> bool:
+        """Returns whether a run is currently in progress"""
+        return bool(self._running) and not self._running.done()
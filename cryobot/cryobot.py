@@ -1,3 +1,4 @@
+import asyncio
 import functools
 from datetime import datetime, time, timedelta
 from zoneinfo import ZoneInfo
@@ -5,10 +6,16 @@ from zoneinfo import ZoneInfo
 import discord
 from discord.ext import commands, tasks
 
+from bot_state import BotState
+from coalescer import Coalescer
 from gankster import Gankster
 from google_api import GoogleAPI
+from google_queue import GoogleQueue
 from helper import debugPrint, getVariable, setVariable
-from scrim_classes import CryoBotError, Scrim, ScrimFormat, Team
+from scrim_classes import CryoBotError, Scrim, ScrimChats, ScrimFormat, Team
+from scrim_messages import ScrimMessages
+from scrim_reconciler import ScrimTransition, ScrimTransitionType, reconcile_scrims
+from send_queue import QueuedMessage, SendPriority, SendQueue
 from discord_stuff import DiscordStuff
 
 DISCORD_TOKEN: str = getVariable("DISCORD_TOKEN")
@@ -21,8 +28,10 @@ CRYOBARK_ROLE_ID: int = getVariable("CRYOBARK_ROLE_ID")
 MANAGER_ROLE_ID: int = getVariable("MANAGER_ROLE_ID")
 POLL_PINGERS: list[int] = getVariable("POLL_PINGERS")
 ALL_MEMBERS: set[int] = getVariable("ALL_MEMBERS")
+SCRIM_STATUS_INTERVALS: dict[str, int] = getVariable("SCRIM_STATUS_INTERVALS")
+SCRIM_SOON_WINDOW: int = getVariable("SCRIM_SOON_WINDOW")
+GOOGLE_RESULTS_DEBOUNCE: int = getVariable("GOOGLE_RESULTS_DEBOUNCE")
 CRYOBARK: Team = getVariable("CRYOBARK")
-WILDCARD_TEAM: Team = getVariable("WILDCARD_TEAM")
 
 class CryoBot:
     def __init__(self):
@@ -31,18 +40,24 @@ class CryoBot:
         self._scrim_channel: discord.TextChannel
         self._error_channel: discord.TextChannel
 
-        self._latest_poll_message: discord.InteractionMessage
+        self._latest_poll_message: discord.Message | discord.PartialMessage = None
         self._poll_voters: set[int] = set()
 
-        self._incoming_scrim_request_messages: list[tuple[Scrim, discord.Message]] = []
-        self._outgoing_scrim_request_messages: list[tuple[Scrim, discord.Message]] = []
+        self._scrim_queue: SendQueue = None
+        self._error_queue: SendQueue = None
+
+        self._incoming_scrim_request_messages: dict[tuple, tuple[Scrim, QueuedMessage]] = {}
+        self._outgoing_scrim_request_messages: dict[tuple, tuple[Scrim, QueuedMessage]] = {}
         self._current_scrims: set[Scrim] = set()
-        self._scrim_messages: dict[Scrim, discord.Message] = {}
+        self._scrim_messages = ScrimMessages()
         self._played_scrims: set[Scrim] = set()
+        self._scrim_status: Coalescer
+        self._scrim_status_interval: int = SCRIM_STATUS_INTERVALS["active"]
+        self._bot_state = BotState()
+        self._bot_state_loaded = False
 
-        debugPrint("Starting Google API")
         self._google_api = GoogleAPI()
-        debugPrint("Starting Gankster")
+        self._google_queue = GoogleQueue(self._google_api.make_batch_call, self._report_google_error)
         self._gankster = Gankster()
 
         intents = discord.Intents.none()
@@ -66,6 +81,29 @@ class CryoBot:
             self._poll_channel = self._bot.get_channel(POLL_CHANNEL_ID)
             self._scrim_channel = self._bot.get_channel(SCRIM_CHANNEL_ID)
             self._error_channel = self._bot.get_channel(ERROR_CHANNEL_ID)
+            if not self._scrim_queue:
+                self._error_queue = SendQueue(self._error_channel)
+                self._scrim_queue = SendQueue(self._scrim_channel, self._report_send_error, self._save_scrim_state)
+                self._scrim_messages.set_queue(self._scrim_queue)
+            if not self._bot_state_loaded:
+                try:
+                    debugPrint("Loading Bot State")
+                    self._load_bot_state()
+                    debugPrint(f"Loaded Bot State: {len(self._current_scrims)} scrims, {len(self._incoming_scrim_request_messages)} incoming, {len(self._outgoing_scrim_request_messages)} outgoing")
+                except Exception as e:
+                    debugPrint(f"Failed to load bot state: {e}")
+                self._bot_state_loaded = True
+            try:
+                debugPrint("Starting Google API")
+                await self._google_api.start()
+            except Exception as e:
+                debugPrint(f"Failed to start Google API: {e}")
+            self._google_queue.start()
+            try:
+                debugPrint("Starting Gankster")
+                await self._gankster.start()
+            except Exception as e:
+                debugPrint(f"Failed to start Gankster: {e}")
             try:
                 synced = await self._bot.tree.sync(guild=discord.Object(id=GUILD_ID))
                 debugPrint(f"Synced {len(synced)} slash commands")
@@ -86,11 +124,6 @@ class CryoBot:
                 debugPrint(f"Starting repeating updating scrim status loop")
             except Exception as e:
                 debugPrint(f"Failed to start repeating updating scrim status loop: {e}")
-            try:
-                refresh_gankster_token.start()
-                debugPrint(f"Starting repeating refresh gankster token loop")
-            except Exception as e:
-                debugPrint(f"Failed to start repeating refresh gankster token loop: {e}")
             await self._gankster.fill_team_stats(CRYOBARK)
 
         @tasks.loop(time=time(hour=4, tzinfo=ZoneInfo("America/New_York")))
@@ -104,6 +137,7 @@ class CryoBot:
                     end = (now + timedelta(days=9)).strftime("%m/%d")
                     poll = DiscordStuff.create_weekly_poll(start, end)
                     self._latest_poll_message = await self._poll_channel.send(poll=poll)
+                    self._save_poll_state()
                     debugPrint("Sucessfully Posted Weekly Poll")
                 except Exception as e:
                     debugPrint(f"Failed To Post Weekly Poll: {e}")
@@ -126,6 +160,7 @@ class CryoBot:
         async def on_poll_vote_add(user: discord.Member, answer):
             debugPrint(f"Adding Poll Vote: user={user}, answer={answer}")
             self._poll_voters.add(user.id)
+            self._save_poll_state()
 
         @tasks.loop(hours=6)
         async def refresh_google_api():
@@ -138,166 +173,78 @@ class CryoBot:
             except Exception as e:
                 debugPrint(f"Issue in Google API loop: {e}")
 
-        async def handle_incoming_scrim_requests():
-            incoming_scrim_requests = await self._gankster.retrieve_incoming_scrim_requests()
-
-            # For every exting scrim request check if still present, if not remove it
-            for scrim_request, _ in self._incoming_scrim_request_messages.copy():
-                found = False
-                for i in range(len(incoming_scrim_requests)):
-                    if scrim_request.equals_exact(incoming_scrim_requests[i]):
-                        found = True
-                        break
-                if not found:
-                    await self._incoming_scrim_request_removed(scrim_request)
-
-            # For every new scrim request check if not already present, if so add it
-            for scrim_request in incoming_scrim_requests:
-                found = False
-                for i in range(len(self._incoming_scrim_request_messages)):
-                    if scrim_request.equals_exact(self._incoming_scrim_request_messages[i][0]):
-                        found = True
-                        break
-                if not found:
+        async def handle_incoming_scrim_requests(chats: ScrimChats):
+            incoming_scrim_requests = {scrim_request.request_key(): scrim_request for scrim_request in chats.incoming_requests}
+
+            # Remove every posted scrim request that's no longer present, then post every new one
+            for key in self._incoming_scrim_request_messages.keys() - incoming_scrim_requests.keys():
+                await self._incoming_scrim_request_removed(self._incoming_scrim_request_messages[key][0])
+
+            for key, scrim_request in incoming_scrim_requests.items():
+                if key not in self._incoming_scrim_request_messages:
                     await self._incoming_scrim_request_recieved(scrim_request)
 
-        async def handle_outgoing_scrim_requests():
-            outgoing_scrim_requests = await self._gankster.retrieve_outgoing_scrim_requests()
-
-            # For every exting scrim request check if still present, if not remove it
-            for scrim_request, _ in self._outgoing_scrim_request_messages.copy():
-                found = False
-                for i in range(len(outgoing_scrim_requests)):
-                    if scrim_request.equals_exact(outgoing_scrim_requests[i]):
-                        found = True
-                        break
-                if not found:
-                    await self._outgoing_scrim_request_removed(scrim_request)
-
-            # For every new scrim request check if not already present, if so add it
-            for scrim_request in outgoing_scrim_requests:
-                found = False
-                for i in range(len(self._outgoing_scrim_request_messages)):
-                    if scrim_request.equals_exact(self._outgoing_scrim_request_messages[i][0]):
-                        found = True
-                        break
-                if not found:
+        async def handle_outgoing_scrim_requests(chats: ScrimChats):
+            outgoing_scrim_requests = {scrim_request.request_key(): scrim_request for scrim_request in chats.outgoing_requests}
+
+            # Remove every posted scrim request that's no longer present, then post every new one
+            for key in self._outgoing_scrim_request_messages.keys() - outgoing_scrim_requests.keys():
+                await self._outgoing_scrim_request_removed(self._outgoing_scrim_request_messages[key][0])
+
+            for key, scrim_request in outgoing_scrim_requests.items():
+                if key not in self._outgoing_scrim_request_messages:
                     await self._outgoing_scrim_request_recieved(scrim_request)
 
-        async def handle_cryobark_scrims():
-            # Manually tested each possible scenario and it works, might add actual comments one day who knows
-            now = datetime.now()
-            for scrim in self._current_scrims.copy():
-                if scrim.get_gankster_removal_time() < now:
-                    if not scrim.open:
-                        self._current_scrims.remove(scrim)
-                        self._played_scrims.add(scrim)
-                    else:
-                        await self._scrim_request_passed(scrim)
-
-            for scrim in self._played_scrims.copy():
-                if scrim.get_scrim_end_time() < now:
-                    self._played_scrims.remove(scrim)
-                    await self._scrim_played(scrim)
-
-            new_scrims = await self._gankster.retrieve_outgoing_scrims(CRYOBARK)
-            for new_scrim in new_scrims:
-                if new_scrim in self._current_scrims:
-                    for old_scrim in self._current_scrims:
-                        if new_scrim == old_scrim:
-                            break
-                    if new_scrim.open != old_scrim.open:
-                        self._current_scrims.remove(old_scrim)
-                        self._current_scrims.add(new_scrim)
-                        if new_scrim.open:
-                            await self._scrim_request_found_cancelled(old_scrim) # GUD
-                            await self._scrim_request_resent(new_scrim) # GUD
-                        else:
-                            if new_scrim.team == WILDCARD_TEAM:
-                                await self._scrim_request_wildcard_booked(new_scrim) # GUD
-                            else:
-                                await self._scrim_request_booked(new_scrim) # GUD
-                    elif new_scrim.team != old_scrim.team:
-                        self._current_scrims.remove(old_scrim)
-                        self._current_scrims.add(new_scrim)
-                        if old_scrim.team == WILDCARD_TEAM:
-                            await self._scrim_request_booked(new_scrim) # GUD
-                        else:
-                            await self._scrim_request_found_cancelled(old_scrim) # GUD
-                            await self._scrim_request_booked(new_scrim) # GUD
-                else:
-                    updated = False
-                    for old_scrim in self._current_scrims:
-                        if new_scrim.time == old_scrim.time and old_scrim not in new_scrims:
-                            updated = True
-                            break
-                    if updated:
-                        if new_scrim.team == WILDCARD_TEAM and old_scrim.team:
-                            new_scrim.team = old_scrim.team
-                        self._current_scrims.remove(old_scrim)
-                        self._current_scrims.add(new_scrim)
-                        if (new_scrim.team == old_scrim.team or old_scrim.team == WILDCARD_TEAM) and new_scrim.team:
-                            if new_scrim.team == WILDCARD_TEAM:
-                                await self._scrim_request_wildcard_booked_updated(new_scrim, old_scrim) # GUD
-                            else:
-                                await self._scrim_request_booked_updated(new_scrim, old_scrim) # GUD
-                        else:
-                            # Team: None/None, TeamA/None, None/TeamB
-                            # Open: True/True,   False/True,   True/False
-                            if new_scrim.open and old_scrim.open:
-                                await self._scrim_request_updated(new_scrim, old_scrim) # GUD
-                            elif new_scrim.open and not old_scrim.open:
-                                await self._scrim_request_found_cancelled(old_scrim) # GUD
-                                await self._scrim_request_resent(new_scrim) # GUD
-                            else:
-                                if new_scrim.team == WILDCARD_TEAM:
-                                    await self._scrim_request_wildcard_updated_booked(new_scrim, old_scrim)
-                                else:
-                                    await self._scrim_request_updated_booked(new_scrim, old_scrim) # GUD
-                    else:
-                        # scrim request created
-                        self._current_scrims.add(new_scrim)
-                        if new_scrim.open:
-                            await self._scrim_request_created(new_scrim)  # GUD
-                        else:
-                            if new_scrim.team == WILDCARD_TEAM:
-                                await self._scrim_request_wildcard_booked(new_scrim) # GUD
-                            else:
-                                await self._scrim_request_booked(new_scrim) # GUD
-                        pass
-
-            for scrim in self._current_scrims.copy():
-                if scrim not in new_scrims:
-                    self._current_scrims.remove(scrim)
-                    await self._scrim_request_created_cancelled(scrim) # GUD
-
-        @tasks.loop(minutes=1)
-        async def update_scrim_status():
-            debugPrint("Starting Update Scrim Status")
-            try:
-                debugPrint("Starting Handle Incoming Scrim Requests")
-                await handle_incoming_scrim_requests()
-                debugPrint("Successfulyl Handle Incoming Scrim Requests")
-            except Exception as e: debugPrint(f"Failed To Handle Incoming Scrim Requests: {e}")
+        async def handle_cryobark_scrims(chats: ScrimChats):
+            new_scrims = await self._gankster.retrieve_outgoing_scrims(CRYOBARK, chats.booked_scrims)
+            reconciliation = reconcile_scrims(self._current_scrims, self._played_scrims, new_scrims, datetime.now())
+            self._current_scrims = reconciliation.current_scrims
+            self._played_scrims = reconciliation.played_scrims
+            for transition in reconciliation.transitions:
+                await self._handle_scrim_transition(transition)
+
+        async def run_status_handler(name: str, handler, chats: ScrimChats) -> Exception:
             try:
-                debugPrint("Starting Handle Outgoing Scrim Requests")
-                await handle_outgoing_scrim_requests()
-                debugPrint("Successfulyl Handle Outgoing Scrim Requests")
-            except Exception as e: debugPrint(f"Failed To Handle Outgoing Scrim Requests: {e}")
+                debugPrint(f"Starting Handle {name}")
+                await handler(chats)
+                debugPrint(f"Successfully Handle {name}")
+            except Exception as e:
+                debugPrint(f"Failed To Handle {name}: {e}")
+                return e
+
+        async def reconcile_scrim_status():
+            debugPrint("Starting Update Scrim Status")
             try:
-                debugPrint("Starting Handle Cryobark Scrims")
-                await handle_cryobark_scrims()
-                debugPrint("Successfulyl Handle Cryobark Scrims")
-            except Exception as e: debugPrint(f"Failed To Handle Cryobark Scrims: {e}")
-            debugPrint("Update Scrim Status 'Successful'")
-
-        @tasks.loop(minutes=45)
-        async def refresh_gankster_token():
-            debugPrint("Refreshing Gankster Token")
-            try: 
-                await self._gankster.refresh()
-                debugPrint("Refreshing Gankster Token Successful")
-            except: debugPrint("Failed to Refresh Gankster Token")
+                chats = await self._gankster.retrieve_scrim_chats()
+            except Exception as e:
+                debugPrint(f"Failed To Retrieve Scrim Chats: {e}")
+                return
+            # Each handler only touches its own state so they can wait on gankster and discord at the same time
+            handlers = {
+                "Incoming Scrim Requests": handle_incoming_scrim_requests,
+                "Outgoing Scrim Requests": handle_outgoing_scrim_requests,
+                "Cryobark Scrims": handle_cryobark_scrims
+            }
+            errors = await asyncio.gather(*(run_status_handler(name, handler, chats) for name, handler in handlers.items()))
+            failed = [name for name, error in zip(handlers, errors) if error]
+            if failed:
+                debugPrint(f"Update Scrim Status Failed For: {', '.join(failed)}")
+            else:
+                debugPrint("Update Scrim Status 'Successful'")
+            try: self._save_scrim_state()
+            except Exception as e: debugPrint(f"Failed To Save Scrim State: {e}")
+
+        # Loop ticks and commands share one coalescer so only one update runs at a time and bursts collapse into one more run
+        self._scrim_status = Coalescer(reconcile_scrim_status)
+
+        @tasks.loop(seconds=SCRIM_STATUS_INTERVALS["active"])
+        async def update_scrim_status():
+            await self._scrim_status.trigger()
+            interval = self._get_scrim_status_interval()
+            if interval != self._scrim_status_interval:
+                debugPrint(f"Changing Update Scrim Status Interval: {self._scrim_status_interval}s -> {interval}s")
+                self._scrim_status_interval = interval
+                update_scrim_status.change_interval(seconds=interval)
 
         def _handle_interaction_error(func):
             @functools.wraps(func)
@@ -343,6 +290,7 @@ class CryoBot:
                             "/retrieve_team_data [team_number] [team_name]\n" \
                             "/update_team_players [team_number] [team_name]\n"\
                             "/change_automatic_google [enable_or_disable]\n"\
+                            "/bot_status\n"\
                             "/help"
 
             embed = discord.Embed(
@@ -373,7 +321,7 @@ class CryoBot:
             await self._gankster.create_scrim_request(scrim)
             debugPrint("Scrim Request Sucessfully Created")
             await interaction.followup.send("Scrim Request Sucessfully Created")
-            await update_scrim_status()
+            await self._scrim_status.trigger()
 
         @self._bot.tree.command(guild=discord.Object(id=GUILD_ID))
         @discord.app_commands.describe(date = "mm/dd/yy", time="hh:mm AM|PM")
@@ -390,7 +338,7 @@ class CryoBot:
             await self._gankster.cancel_scrim_request(scrim)
             debugPrint("Scrim Request Sucessfully Cancelled")
             await interaction.followup.send("Scrim Request Sucessfully Cancelled")
-            await update_scrim_status()
+            await self._scrim_status.trigger()
 
         @self._bot.tree.command(guild=discord.Object(id=GUILD_ID))
         @discord.app_commands.describe(date = "mm/dd/yy", time="hh:mm AM|PM")
@@ -407,7 +355,7 @@ class CryoBot:
             await self._gankster.cancel_scrim_block(scrim, cancellation_msg)
             debugPrint("Scrim Block Sucessfully Cancelled")
             await interaction.followup.send("Scrim Block Sucessfully Cancelled")
-            await update_scrim_status()
+            await self._scrim_status.trigger()
 
         @self._bot.tree.command(guild=discord.Object(id=GUILD_ID))
         @discord.app_commands.choices(format=formats)
@@ -426,7 +374,7 @@ class CryoBot:
             await self._gankster.process_scrim_request(scrim, True)
             debugPrint("Scrim Request Sucessfully Accepted")
             await interaction.followup.send("Scrim Request Sucessfully Accepted")
-            await update_scrim_status()
+            await self._scrim_status.trigger()
 
         @self._bot.tree.command(guild=discord.Object(id=GUILD_ID))
         @discord.app_commands.choices(format=formats)
@@ -445,7 +393,7 @@ class CryoBot:
             await self._gankster.process_scrim_request(scrim, False)
             debugPrint("Scrim Request Sucessfully Declined")
             await interaction.followup.send("Scrim Request Sucessfully Declined")
-            await update_scrim_status()
+            await self._scrim_status.trigger()
 
         @self._bot.tree.command(guild=discord.Object(id=GUILD_ID))
         @discord.app_commands.choices(format=formats)
@@ -468,7 +416,7 @@ class CryoBot:
             await self._gankster.send_scrim_request(scrim)
             debugPrint("Scrim Request Sucessfully Sent")
             await interaction.followup.send("Scrim Request Sucessfully Sent")
-            await update_scrim_status()
+            await self._scrim_status.trigger()
 
         @self._bot.tree.command(guild=discord.Object(id=GUILD_ID))
         @_handle_interaction_error
@@ -527,6 +475,27 @@ class CryoBot:
             debugPrint("Sucessfully Reset Scouting Scrim Results")
             await interaction.followup.send("Sucessfully Reset Scouting Scrim Results")
 
+        @self._bot.tree.command(guild=discord.Object(id=GUILD_ID))
+        @_handle_interaction_error
+        async def bot_status(interaction: discord.Interaction):
+            debugPrint(f"Attempting to show bot status")
+            message = f"Update Scrim Status Interval: {self._scrim_status_interval}s\n" \
+                      f"Tracked Scrims: {len(self._current_scrims)}\n" \
+                      f"Scrims Being Played: {len(self._played_scrims)}\n" \
+                      f"Incoming Scrim Requests: {len(self._incoming_scrim_request_messages)}\n" \
+                      f"Outgoing Scrim Requests: {len(self._outgoing_scrim_request_messages)}\n" \
+                      f"Queued Scrim Messages: {len(self._scrim_queue)}\n" \
+                      f"Queued Error Messages: {len(self._error_queue)}\n" \
+                      f"Queued Google Calls: {len(self._google_queue)}"
+
+            embed = discord.Embed(
+                title="Bot Status",
+                color=discord.Color.dark_gray(),
+                description=message
+            )
+            await interaction.response.send_message(embed=embed)
+            debugPrint("Successfully sent bot status")
+
         @self._bot.tree.command(guild=discord.Object(id=GUILD_ID))
         @_handle_interaction_error
         async def change_automatic_google(interaction: discord.Interaction, enable_or_disable: bool):
@@ -536,6 +505,65 @@ class CryoBot:
             debugPrint("Sucessfully Reset Scouting Scrim Results")
             await interaction.followup.send("Sucessfully Reset Scouting Scrim Results")
 
+    def _load_bot_state(self):
+        """Loads everything being tracked before the last restart, messages are restored as partial messages"""
+        for scrim, message_id in self._bot_state.load_scrims("current"):
+            self._current_scrims.add(scrim)
+            if message_id:
+                self._scrim_messages.restore(scrim, self._scrim_channel.get_partial_message(message_id))
+        for scrim, message_id in self._bot_state.load_scrims("played"):
+            self._played_scrims.add(scrim)
+            if message_id:
+                self._scrim_messages.restore(scrim, self._scrim_channel.get_partial_message(message_id))
+        # Requests whose message never went out aren't loaded so they get posted again
+        for scrim, message_id in self._bot_state.load_scrims("incoming"):
+            if message_id:
+                self._incoming_scrim_request_messages[scrim.request_key()] = (scrim, QueuedMessage(self._scrim_channel.get_partial_message(message_id)))
+        for scrim, message_id in self._bot_state.load_scrims("outgoing"):
+            if message_id:
+                self._outgoing_scrim_request_messages[scrim.request_key()] = (scrim, QueuedMessage(self._scrim_channel.get_partial_message(message_id)))
+
+        latest_poll_message_id = self._bot_state.get_value("latest_poll_message_id")
+        if latest_poll_message_id:
+            self._latest_poll_message = self._poll_channel.get_partial_message(latest_poll_message_id)
+        self._poll_voters = set(self._bot_state.get_value("poll_voters", []))
+
+    def _save_scrim_state(self):
+        """Saves the scrims being tracked and their message ids so they survive a restart, also called whenever the scrim queue empties"""
+        self._bot_state.save_scrims("current", [(scrim, self._scrim_messages.message_id(scrim)) for scrim in self._current_scrims])
+        self._bot_state.save_scrims("played", [(scrim, self._scrim_messages.message_id(scrim)) for scrim in self._played_scrims])
+        self._bot_state.save_scrims("incoming", [(scrim, message.id) for scrim, message in self._incoming_scrim_request_messages.values()])
+        self._bot_state.save_scrims("outgoing", [(scrim, message.id) for scrim, message in self._outgoing_scrim_request_messages.values()])
+
+    def _save_poll_state(self):
+        """Saves the latest poll and who voted in it so they survive a restart"""
+        try:
+            self._bot_state.set_value("latest_poll_message_id", self._latest_poll_message.id if self._latest_poll_message else None)
+            self._bot_state.set_value("poll_voters", list(self._poll_voters))
+        except Exception as e: debugPrint(f"Failed To Save Poll State: {e}")
+
+    def _get_scrim_status_interval(self) -> int:
+        """Returns how many seconds to wait between scrim status updates based on how much is going on"""
+        soon = datetime.now() + timedelta(seconds=SCRIM_SOON_WINDOW)
+        if self._played_scrims or any(scrim.time < soon for scrim in self._current_scrims):
+            return SCRIM_STATUS_INTERVALS["soon"]
+        if (any(scrim.open for scrim in self._current_scrims) or self._incoming_scrim_request_messages
+            or self._outgoing_scrim_request_messages):
+            return SCRIM_STATUS_INTERVALS["active"]
+        return SCRIM_STATUS_INTERVALS["idle"]
+
+    def _report_send_error(self, e: Exception):
+        """Reports a message the scrim queue failed to send to the error channel"""
+        self._error_queue.send(f"Uh Oh <@{TREBOTEHTREE}>, I ran into an issue sending a scrim message: {e}", priority=SendPriority.ERROR)
+
+    def _report_google_error(self, e: Exception):
+        """Reports a queued google call that was dropped to the error channel"""
+        self._error_queue.send(f"Uh Oh <@{TREBOTEHTREE}>, a google call failed: {e}", priority=SendPriority.ERROR)
+
+    def _queue_google_call(self, scrim: Scrim, payload: dict, cancels: dict=None):
+        """Queues a google call for the given scrim, calls for the same team and day are made in order and coalesced"""
+        self._google_queue.enqueue(f"{scrim.team.name}|{scrim.time.strftime('%m/%d/%Y')}", payload, cancels)
+
     def _handle_automatic_error(func):
         @functools.wraps(func)
         async def wrapper(*args, **kwargs):
@@ -544,155 +572,147 @@ class CryoBot:
             except CryoBotError as e:
                 self: CryoBot = args[0]  # kinda skuffed but it works
                 debugPrint(f"CryoBotError performing command {func.__name__}: {e}")
-                await self._error_channel.send(f"Uh Oh <@{TREBOTEHTREE}>, we ran into an issue: {e}")
+                self._error_queue.send(f"Uh Oh <@{TREBOTEHTREE}>, we ran into an issue: {e}", priority=SendPriority.ERROR)
             except Exception as e:
                 self = args[0]
                 debugPrint(f"Error performing command {func.__name__}: {e}")
-                await self._error_channel.send(f"Uh Oh <@{TREBOTEHTREE}>, I ran into an issue: {e}")
+                self._error_queue.send(f"Uh Oh <@{TREBOTEHTREE}>, I ran into an issue: {e}", priority=SendPriority.ERROR)
         return wrapper
 
+    async def _handle_scrim_transition(self, transition: ScrimTransition):
+        if transition.type == ScrimTransitionType.CREATED:
+            await self._scrim_request_created(transition.scrim)
+        elif transition.type == ScrimTransitionType.BOOKED:
+            await self._scrim_request_booked(transition.scrim)
+        elif transition.type == ScrimTransitionType.WILDCARD_BOOKED:
+            await self._scrim_request_wildcard_booked(transition.scrim)
+        elif transition.type == ScrimTransitionType.RESENT:
+            await self._scrim_request_resent(transition.scrim)
+        elif transition.type == ScrimTransitionType.FOUND_CANCELLED:
+            await self._scrim_request_found_cancelled(transition.scrim)
+        elif transition.type == ScrimTransitionType.CREATED_CANCELLED:
+            await self._scrim_request_created_cancelled(transition.scrim)
+        elif transition.type == ScrimTransitionType.UPDATED:
+            await self._scrim_request_updated(transition.scrim, transition.old_scrim)
+        elif transition.type == ScrimTransitionType.UPDATED_BOOKED:
+            await self._scrim_request_updated_booked(transition.scrim, transition.old_scrim)
+        elif transition.type == ScrimTransitionType.WILDCARD_UPDATED_BOOKED:
+            await self._scrim_request_wildcard_updated_booked(transition.scrim, transition.old_scrim)
+        elif transition.type == ScrimTransitionType.BOOKED_UPDATED:
+            await self._scrim_request_booked_updated(transition.scrim, transition.old_scrim)
+        elif transition.type == ScrimTransitionType.WILDCARD_BOOKED_UPDATED:
+            await self._scrim_request_wildcard_booked_updated(transition.scrim, transition.old_scrim)
+        elif transition.type == ScrimTransitionType.PASSED:
+            await self._scrim_request_passed(transition.scrim)
+        elif transition.type == ScrimTransitionType.PLAYED:
+            await self._scrim_played(transition.scrim)
+
     @_handle_automatic_error
     async def _scrim_request_created(self, scrim: Scrim):
-        if scrim in  self._scrim_messages:
-            await self._scrim_messages[scrim].delete()
-
         embed = DiscordStuff.create_scrim_request_created_embed(scrim)
-        self._scrim_messages[scrim] = await self._scrim_channel.send(f"<@&{MANAGER_ROLE_ID}>", embed=embed)
+        self._scrim_messages.post(scrim, f"<@&{MANAGER_ROLE_ID}>", embed)
 
     @_handle_automatic_error
     async def _scrim_request_booked(self, scrim: Scrim):
-        if scrim in self._scrim_messages:
-            await self._scrim_messages[scrim].delete()
-
         embed =DiscordStuff.create_scrim_request_booked_embed(scrim)
-        self._scrim_messages[scrim] = await self._scrim_channel.send(f"<@&{CRYOBARK_ROLE_ID}>", embed=embed)
+        self._scrim_messages.post(scrim, f"<@&{CRYOBARK_ROLE_ID}>", embed)
 
-        await self._google_api.found_scrim(scrim)
+        self._queue_google_call(scrim, self._google_api.found_scrim_payload(scrim))
 
     @_handle_automatic_error
     async def _scrim_request_found_cancelled(self, scrim: Scrim):
-        if scrim in self._scrim_messages:
-            await self._scrim_messages[scrim].delete()
-            self._scrim_messages.pop(scrim)
+        self._scrim_messages.remove(scrim)
 
         embed = DiscordStuff.create_scrim_request_found_cancelled_embed(scrim)
-        await self._scrim_channel.send(f"<@&{CRYOBARK_ROLE_ID}>", embed=embed)
+        self._scrim_messages.send(f"<@&{CRYOBARK_ROLE_ID}>", embed)
 
-        await self._google_api.cancel_scrim(scrim)
+        self._queue_google_call(scrim, self._google_api.cancel_scrim_payload(scrim), self._google_api.found_scrim_payload(scrim))
 
     @_handle_automatic_error
     async def _scrim_request_created_cancelled(self, scrim: Scrim):
-        if scrim in self._scrim_messages:
-            await self._scrim_messages[scrim].delete()
-            self._scrim_messages.pop(scrim)
+        self._scrim_messages.remove(scrim)
 
         embed = DiscordStuff.create_scrim_request_created_cancelled_embed(scrim)
-        await self._scrim_channel.send(f"<@&{MANAGER_ROLE_ID}>", embed=embed)
+        self._scrim_messages.send(f"<@&{MANAGER_ROLE_ID}>", embed)
 
     @_handle_automatic_error
     async def _scrim_request_resent(self, scrim: Scrim):
-        if scrim in self._scrim_messages:
-            await self._scrim_messages[scrim].delete()
-
         embed =DiscordStuff.create_scrim_request_resent_embed(scrim)
-        self._scrim_messages[scrim] = await self._scrim_channel.send(f"<@&{MANAGER_ROLE_ID}>", embed=embed)
+        self._scrim_messages.post(scrim, f"<@&{MANAGER_ROLE_ID}>", embed)
 
     @_handle_automatic_error
     async def _scrim_request_updated(self, new_scrim: Scrim, old_scrim: Scrim):
-        if old_scrim in self._scrim_messages:
-            await self._scrim_messages[old_scrim].delete()
-            self._scrim_messages.pop(old_scrim)
-
         embed =DiscordStuff.create_scrim_request_updated_embed(new_scrim)
-        self._scrim_messages[new_scrim] = await self._scrim_channel.send(f"<@&{MANAGER_ROLE_ID}>", embed=embed)
+        self._scrim_messages.post(new_scrim, f"<@&{MANAGER_ROLE_ID}>", embed, old_scrim)
 
     @_handle_automatic_error
     async def _scrim_request_updated_booked(self, new_scrim: Scrim, old_scrim: Scrim):
-        if old_scrim in self._scrim_messages:
-            self._scrim_messages[new_scrim] = self._scrim_messages.pop(old_scrim)
+        self._scrim_messages.move(old_scrim, new_scrim)
 
         await self._scrim_request_booked(new_scrim)
 
     @_handle_automatic_error
     async def _scrim_request_wildcard_updated_booked(self, new_scrim: Scrim, old_scrim: Scrim):
-        if old_scrim in self._scrim_messages:
-            self._scrim_messages[new_scrim] = self._scrim_messages.pop(old_scrim)
+        self._scrim_messages.move(old_scrim, new_scrim)
 
         await self._scrim_request_wildcard_booked(new_scrim)
 
     @_handle_automatic_error
     async def _scrim_request_booked_updated(self, new_scrim: Scrim, old_scrim: Scrim):
-        if old_scrim in self._scrim_messages:
-            await self._scrim_messages[old_scrim].delete()
-            self._scrim_messages.pop(old_scrim)
-
+        # Always ping since the team's schedule changed
         embed =DiscordStuff.create_scrim_request_booked_updated_embed(new_scrim)
-        self._scrim_messages[new_scrim] = await self._scrim_channel.send(f"<@&{CRYOBARK_ROLE_ID}>", embed=embed)
+        self._scrim_messages.post(new_scrim, f"<@&{CRYOBARK_ROLE_ID}>", embed, old_scrim, ping=True)
 
-        await self._google_api.cancel_scrim(old_scrim)
-        await self._google_api.found_scrim(new_scrim)
+        self._queue_google_call(old_scrim, self._google_api.cancel_scrim_payload(old_scrim), self._google_api.found_scrim_payload(old_scrim))
+        self._queue_google_call(new_scrim, self._google_api.found_scrim_payload(new_scrim))
 
     @_handle_automatic_error
     async def _scrim_request_wildcard_booked(self, scrim: Scrim):
         # Found wildcard
-        if scrim in self._scrim_messages:
-            await self._scrim_messages[scrim].delete()
-
         embed =DiscordStuff.create_scrim_request_wildcard_booked_embed(scrim)
-        self._scrim_messages[scrim] = await self._scrim_channel.send(f"<@&{CRYOBARK_ROLE_ID}>", embed=embed)
+        self._scrim_messages.post(scrim, f"<@&{CRYOBARK_ROLE_ID}>", embed)
 
     @_handle_automatic_error
     async def _scrim_request_wildcard_booked_updated(self, new_scrim: Scrim, old_scrim: Scrim):
         # Changed format of one wildcard scrim to another format
-        if old_scrim in self._scrim_messages:
-            await self._scrim_messages[old_scrim].delete()
-            self._scrim_messages.pop(old_scrim)
-
         embed =DiscordStuff.create_scrim_request_wildcard_booked_updated_embed(new_scrim)
-        self._scrim_messages[new_scrim] = await self._scrim_channel.send(f"<@&{CRYOBARK_ROLE_ID}>", embed=embed)
+        self._scrim_messages.post(new_scrim, f"<@&{CRYOBARK_ROLE_ID}>", embed, old_scrim, ping=True)
 
     @_handle_automatic_error
     async def _scrim_played(self, scrim: Scrim):
-        if scrim in self._scrim_messages:
-            await self._scrim_messages[scrim].delete()
-            self._scrim_messages.pop(scrim)
+        self._scrim_messages.remove(scrim)
 
         embed =DiscordStuff.create_scrim_played_embed(scrim)
-        await self._scrim_channel.send(embed=embed)
+        self._scrim_messages.send(None, embed)
 
-        await self._google_api.update_scrim_results()
+        # Scrims in a block finish close together so they share one results update
+        self._google_queue.enqueue("results", self._google_api.update_scrim_results_payload(), debounce=GOOGLE_RESULTS_DEBOUNCE)
 
     @_handle_automatic_error
     async def _scrim_request_passed(self, scrim: Scrim):
-        if scrim in self._scrim_messages:
-            await self._scrim_messages[scrim].delete()
-            self._scrim_messages.pop(scrim)
+        self._scrim_messages.remove(scrim)
 
     @_handle_automatic_error
     async def _incoming_scrim_request_removed(self, scrim: Scrim):
-        for scrim_request_message in self._incoming_scrim_request_messages:
-            if scrim_request_message[0].equals_exact(scrim):
-                await scrim_request_message[1].delete()
-                self._incoming_scrim_request_messages.remove(scrim_request_message)
-                break
+        key = scrim.request_key()
+        if key in self._incoming_scrim_request_messages:
+            self._scrim_queue.delete(self._incoming_scrim_request_messages.pop(key)[1])
 
     @_handle_automatic_error
     async def _incoming_scrim_request_recieved(self, scrim: Scrim):
         embed = DiscordStuff.create_scrim_request_recieved_embed(scrim)
-        self._incoming_scrim_request_messages.append((scrim, await self._scrim_channel.send(f"<@&{MANAGER_ROLE_ID}>", embed=embed)))
+        self._incoming_scrim_request_messages[scrim.request_key()] = (scrim, self._scrim_queue.post(f"<@&{MANAGER_ROLE_ID}>", embed, priority=SendPriority.PING))
 
     @_handle_automatic_error
     async def _outgoing_scrim_request_removed(self, scrim: Scrim):
-        for scrim_request_message in self._outgoing_scrim_request_messages:
-            if scrim_request_message[0].equals_exact(scrim):
-                await scrim_request_message[1].delete()
-                self._outgoing_scrim_request_messages.remove(scrim_request_message)
-                break
+        key = scrim.request_key()
+        if key in self._outgoing_scrim_request_messages:
+            self._scrim_queue.delete(self._outgoing_scrim_request_messages.pop(key)[1])
 
     @_handle_automatic_error
     async def _outgoing_scrim_request_recieved(self, scrim: Scrim):
         embed = DiscordStuff.create_scrim_request_sent_embed(scrim)
-        self._outgoing_scrim_request_messages.append((scrim, await self._scrim_channel.send(f"<@&{MANAGER_ROLE_ID}>", embed=embed)))
+        self._outgoing_scrim_request_messages[scrim.request_key()] = (scrim, self._scrim_queue.post(f"<@&{MANAGER_ROLE_ID}>", embed, priority=SendPriority.PING))
 
 
 if __name__ == "__main__":
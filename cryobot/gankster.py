@@ -1,38 +1,82 @@
-import asyncio
-
-from browser import Browser
 from gankster_api import GanksterAPI
 from helper import getVariable
-from scrim_classes import Player, Scrim, Team
+from scrim_classes import Player, Scrim, ScrimChats, Team
 
 CRYOBARK: Team = getVariable("CRYOBARK")
 WILDCARD_TEAM: Team = getVariable("WILDCARD_TEAM")
+SELENIUM_BROWSER: bool = getVariable("SELENIUM_BROWSER")
 
 class Gankster:
     """
     Handles everything to do with Gankster and determines best sub class to perform task
 
     Currently just a passthrough since Browser is deprecated and GanksterAPI does everything
+    Browser is only imported when SELENIUM_BROWSER is enabled since loading selenium slows down startup
     """
     def __init__(self):
-        self._gankster_api = GanksterAPI()
-        # self._browser = Browser()
+        self._gankster_api: GanksterAPI = None
+        self._browser = None
+        if SELENIUM_BROWSER:
+            from browser import Browser
+            self._browser = Browser()
+
+    def _get_gankster_api(self) -> GanksterAPI:
+        """Returns the GanksterAPI client, creating it if start hasn't been called yet"""
+        if not self._gankster_api:
+            self._gankster_api = GanksterAPI()
+        return self._gankster_api
+
+    async def start(self):
+        """
+        Creates the GanksterAPI client and retrieves its first bearer, should be called once the event loop is running
+
+        Calling this again after it succeeded does nothing
+
+        Returns:
+            None
+        """
+        if self._gankster_api and self._gankster_api.has_bearer():
+            return
+        await self._get_gankster_api().refresh_bearer()
 
     async def refresh(self):
         """
-        Refreshes everything for gankster to be called every so often
+        Forces a bearer refresh, GanksterAPI already refreshes on its own before the bearer expires
 
         Returns:
             None
         """
-        await asyncio.to_thread(self._gankster_api.refresh_bearer)
+        await self._get_gankster_api().refresh_bearer()
+
+    async def close(self):
+        """
+        Closes any open connections to gankster
+
+        Returns:
+            None
+        """
+        if self._gankster_api:
+            await self._gankster_api.close()
+
+    async def retrieve_scrim_chats(self) -> ScrimChats:
+        """
+        Retrieves the incoming requests, outgoing requests, and booked scrims for the default user in one call
+
+        Returns:
+            ScrimChats: The incoming requests, outgoing requests, and booked scrims with filled in teams
+
+        Raises:
+            CryoBotError: If issue occurs
+        """
+        return await self._get_gankster_api().retrieve_scrim_chats()
 
-    async def retrieve_outgoing_scrims(self, team: Team) -> list[Scrim]:
+    async def retrieve_outgoing_scrims(self, team: Team, booked_scrims: list[Scrim]=None) -> list[Scrim]:
         """
         Retrieves a list of scrim requests the team has sent out
 
         Args:
             team (Team): The team to view outgoing scrims for
+            booked_scrims (list[Scrim]): Cryobark's already retrieved booked scrims, retrieved if not given
 
         Returns:
             list[Scrim]: The list of outgoing scrim requests, team unknown
@@ -40,7 +84,7 @@ class Gankster:
         Raises:
             CryoBotError: If issue occurs
         """
-        return await asyncio.to_thread(self._gankster_api.retrieve_outgoing_scrims, team)
+        return await self._get_gankster_api().retrieve_outgoing_scrims(team, booked_scrims)
 
     async def retrieve_incoming_scrim_requests(self) -> list[Scrim]:
         """
@@ -52,7 +96,7 @@ class Gankster:
         Raises:
             CryoBotError: If issue occurs
         """
-        return await asyncio.to_thread(self._gankster_api.retrieve_incoming_scrim_requests)
+        return await self._get_gankster_api().retrieve_incoming_scrim_requests()
 
     async def retrieve_outgoing_scrim_requests(self) -> list[Scrim]:
         """
@@ -64,7 +108,7 @@ class Gankster:
         Raises:
             CryoBotError: If issue occurs
         """
-        return await asyncio.to_thread(self._gankster_api.retrieve_outgoing_scrim_requests)
+        return await self._get_gankster_api().retrieve_outgoing_scrim_requests()
 
     async def fill_team_stats(self, team: Team) -> None:
         """
@@ -79,7 +123,7 @@ class Gankster:
         Raises:
             CryoBotError: If issue occurs
         """
-        await asyncio.to_thread(self._gankster_api.fill_team_stats, team)
+        await self._get_gankster_api().fill_team_stats(team)
 
     async def update_team_players(self, team: Team) -> None:
         """
@@ -94,7 +138,7 @@ class Gankster:
         Raises:
             CryoBotError: If issue occurs
         """
-        await asyncio.to_thread(self._gankster_api.update_team_players, team)
+        await self._get_gankster_api().update_team_players(team)
 
     async def fill_player_stats(self, player: Player) -> None:
         """
@@ -109,7 +153,7 @@ class Gankster:
         Raises:
             CryoBotError: If issue occurs
         """
-        await asyncio.to_thread(self._gankster_api.fill_player_stats, player)
+        await self._get_gankster_api().fill_player_stats(player)
 
     async def process_scrim_request(self, scrim: Scrim, accept:bool=True) -> bool:
         """
@@ -125,7 +169,7 @@ class Gankster:
         Raises:
             CryoBotError: If issue occurs
         """
-        return await asyncio.to_thread(self._gankster_api.process_scrim_request, scrim, accept)
+        return await self._get_gankster_api().process_scrim_request(scrim, accept)
 
     async def create_scrim_request(self, scrim: Scrim) -> None:
         """
@@ -137,7 +181,7 @@ class Gankster:
         Raises:
             CryoBotError: If issue occurs
         """
-        await asyncio.to_thread(self._gankster_api.create_scrim_request, scrim)
+        await self._get_gankster_api().create_scrim_request(scrim)
 
     async def cancel_scrim_request(self, scrim: Scrim) -> None:
         """
@@ -149,7 +193,7 @@ class Gankster:
         Raises:
             CryoBotError: If issue occurs
         """
-        await asyncio.to_thread(self._gankster_api.cancel_scrim_request, scrim)
+        await self._get_gankster_api().cancel_scrim_request(scrim)
 
     async def cancel_scrim_block(self, scrim: Scrim, message: str) -> None:
         """
@@ -161,7 +205,7 @@ class Gankster:
         Raises:
             CryoBotError: If issue occurs
         """
-        await asyncio.to_thread(self._gankster_api.cancel_scrim_block, scrim, message)
+        await self._get_gankster_api().cancel_scrim_block(scrim, message)
 
     async def send_scrim_request(self, scrim: Scrim) -> None:
         """
@@ -173,4 +217,4 @@ class Gankster:
         Raises:
             CryoBotError: If issue occurs
         """
-        await asyncio.to_thread(self._gankster_api.send_scrim_request, scrim)
\ No newline at end of file
+        await self._get_gankster_api().send_scrim_request(scrim)
\ No newline at end of file
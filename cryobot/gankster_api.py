@@ -1,55 +1,131 @@
 
+import asyncio
 from datetime import datetime, timedelta
 
-import requests
+from aiohttp import ClientResponse, ClientSession, TCPConnector
 
-from helper import debugPrint, getVariable, setVariable
-from scrim_classes import Champion, CryoBotError, ErrorName, GanksterRank, Player, Reputation, ResponseTime, Scrim, ScrimFormat, Team
+from cache import TTLCache
+from helper import debugPrint, getVariable, normalizeTeamName, setVariable
+from rate_limiter import TokenBucket, parse_retry_after
+from scrim_classes import Champion, CryoBotError, ErrorName, GanksterRank, Player, Reputation, ResponseTime, Scrim, ScrimChats, ScrimFormat, Team
+from team_index import TeamIndex
 
 GANKSTER_API_KEY: str = getVariable("GANKSTER_API_KEY")
 CRYOBARK: Team = getVariable("CRYOBARK")
+GANKSTER_RATE_LIMITS: dict[str, tuple[int, int]] = getVariable("GANKSTER_RATE_LIMITS")
+GANKSTER_MAX_RETRIES: int = getVariable("GANKSTER_MAX_RETRIES")
+TEAM_CACHE_SIZE: int = getVariable("TEAM_CACHE_SIZE")
+TEAM_CACHE_TTL: int = getVariable("TEAM_CACHE_TTL")
+GANKSTER_REFRESH_MARGIN: int = getVariable("GANKSTER_REFRESH_MARGIN")
 
 class GanksterAPI:
     """
     Handles everything that has to do with gankster API calls, and everything currently supports everything that uses gankster
 
+    Creating this makes no calls, the bearer is retrieved by the first call (or Gankster.start)
+    After that the bearer is refreshed in the background before it expires, and a call rejected with a 401 refreshes it and retries once
+    All calls share one pooled keep-alive session that is created on first use, so this must be used from within the event loop
+    Every call waits on the rate limit for its endpoint (GANKSTER_RATE_LIMITS) and is retried after a 429
+    Team lookups are cached by number and name for TEAM_CACHE_TTL seconds, and every parsed team's name is saved to the TeamIndex
+
     GANKSTER_REFRESH_TOKEN (in update_vars.json) needed
     """
     def __init__(self):
         self._bearer: str = ""
+        self._bearer_expiry: datetime = datetime.min
+        self._bearer_refresh: asyncio.Task = None
+        self._bearer_refresher: asyncio.Task = None
         self._headers: dict[str, str] = {"authorization": self._bearer, "cookie": f"g-active-team={CRYOBARK.number}"}
         self._refresh_token: str = getVariable("GANKSTER_REFRESH_TOKEN")
+        self._session: ClientSession = None
+        self._rate_limits: dict[str, TokenBucket] = {endpoint: TokenBucket(*limit) for endpoint, limit in GANKSTER_RATE_LIMITS.items()}
+        self._team_cache = TTLCache(TEAM_CACHE_SIZE, TEAM_CACHE_TTL)
+        self._team_index = TeamIndex()
+
+    def _get_session(self) -> ClientSession:
+        """Returns the shared session, creating it if it doesn't exist yet"""
+        if not self._session or self._session.closed:
+            self._session = ClientSession(connector=TCPConnector(limit=10, keepalive_timeout=60))
+        return self._session
+
+    async def close(self) -> None:
+        """
+        Closes the shared session and stops refreshing the bearer, both will restart if another call is made
+
+        Returns:
+            None
+        """
+        if self._bearer_refresher:
+            self._bearer_refresher.cancel()
+            self._bearer_refresher = None
+        if self._session:
+            await self._session.close()
+            self._session = None
 
-        self.refresh_bearer()
+    def has_bearer(self) -> bool:
+        """Returns whether a bearer has been retrieved yet"""
+        return bool(self._bearer)
 
-    def refresh_bearer(self) -> None:
+    def _bearer_is_valid(self) -> bool:
+        """Returns whether there is a bearer that hasn't expired"""
+        return bool(self._bearer) and self._bearer_expiry > datetime.now()
+
+    async def refresh_bearer(self) -> None:
         """
-        Refreshes everything for gankster to be called every so often
+        Refreshes everything for gankster, if a refresh is already happening this waits on it instead of starting another
 
         Returns:
             None
         """
+        if not self._bearer_refresh or self._bearer_refresh.done():
+            self._bearer_refresh = asyncio.create_task(self._retrieve_bearer())
+        await asyncio.shield(self._bearer_refresh)
+
+    async def _refresh_stale_bearer(self, stale_bearer: str) -> None:
+        """Refreshes the bearer after it was rejected, unless another call already replaced it"""
+        if self._bearer == stale_bearer:
+            await self.refresh_bearer()
+
+    async def _retrieve_bearer(self) -> None:
+        """Retrieves a new bearer and schedules it to be refreshed GANKSTER_REFRESH_MARGIN seconds before it expires"""
         url = f"https://securetoken.googleapis.com/v1/token?key={GANKSTER_API_KEY}"
         payload = {
             "grant_type": "refresh_token",
             "refresh_token": self._refresh_token,
         }
 
-        resp = requests.post(url, data=payload)
-        resp.raise_for_status()
-        data = resp.json()
+        async with self._get_session().post(url, data=payload) as resp:
+            resp.raise_for_status()
+            data = await resp.json(content_type=None)
         self._bearer = f"Bearer {data['access_token']}"
-        self._headers["authorization"] = self._bearer
-        self._headers["authorization"] = self._headers["authorization"]
-        self._refresh_token = data["refresh_token"]
-        setVariable("GANKSTER_REFRESH_TOKEN", self._refresh_token)
-
-    def _handle_response(self, response: requests.Response, error_fields: str) -> dict:
+        self._bearer_expiry = datetime.now() + timedelta(seconds=int(data.get("expires_in", 3600)))
+        self._headers = {**self._headers, "authorization": self._bearer}
+        if data["refresh_token"] != self._refresh_token:
+            self._refresh_token = data["refresh_token"]
+            setVariable("GANKSTER_REFRESH_TOKEN", self._refresh_token)
+
+        if not self._bearer_refresher or self._bearer_refresher.done():
+            self._bearer_refresher = asyncio.create_task(self._refresh_bearer_before_expiry())
+
+    async def _refresh_bearer_before_expiry(self) -> None:
+        """Runs in the background refreshing the bearer shortly before it expires, retrying every minute if it fails"""
+        while True:
+            refresh_time = self._bearer_expiry - timedelta(seconds=GANKSTER_REFRESH_MARGIN)
+            await asyncio.sleep(max((refresh_time - datetime.now()).total_seconds(), 0))
+            try:
+                debugPrint("Refreshing Gankster Token")
+                await self.refresh_bearer()
+                debugPrint("Refreshing Gankster Token Successful")
+            except Exception as e:
+                debugPrint(f"Failed to Refresh Gankster Token: {e}")
+                await asyncio.sleep(60)
+
+    async def _handle_response(self, response: ClientResponse, error_fields: str) -> dict:
         """
         Parses response and raises error if request was invalid
 
         Args:
-            response (requests.Response): The response to parse
+            response (ClientResponse): The response to parse
             error_fields (str): The error fields to return if an error occured
 
         Returns:
@@ -58,28 +134,28 @@ class GanksterAPI:
         Raises:
             CryoBotError: If issue occurs
         """
-        if response.status_code == 200 or response.status_code == 201:
-            try: return response.json()
+        if response.status == 200 or response.status == 201:
+            try: return await response.json(content_type=None)
             except: return None
-        if response.status_code == 204:
+        if response.status == 204:
             raise CryoBotError(ErrorName.GANKSTER_NO_CONTENT, error_fields)
-        if response.status_code == 400:
+        if response.status == 400:
             raise CryoBotError(ErrorName.GANKSTER_BAD_REQUEST, error_fields)
-        if response.status_code == 401:
+        if response.status == 401:
             raise CryoBotError(ErrorName.GANKSTER_UNAUTHORIZED, error_fields)
-        if response.status_code == 403:
+        if response.status == 403:
             raise CryoBotError(ErrorName.GANKSTER_FORBIDDEN, error_fields)
-        if response.status_code == 404:
+        if response.status == 404:
             raise CryoBotError(ErrorName.GANKSTER_ENDPOINT, error_fields)
-        if response.status_code == 408:
+        if response.status == 408:
             raise CryoBotError(ErrorName.GANKSTER_TIMEOUT, error_fields)
-        if response.status_code == 429:
+        if response.status == 429:
             raise CryoBotError(ErrorName.GANKSTER_TOO_MANY_REQUESTS, error_fields)
-        if response.status_code >= 500 and response.status_code <=504:
-            raise CryoBotError(ErrorName.GANKSTER_UNAVAILIBLE, error_fields + f", status_code={response.status_code}")
-        raise CryoBotError(ErrorName.GANKSTER_FAILED, error_fields + f", status_code={response.status_code}")
+        if response.status >= 500 and response.status <=504:
+            raise CryoBotError(ErrorName.GANKSTER_UNAVAILIBLE, error_fields + f", status_code={response.status}")
+        raise CryoBotError(ErrorName.GANKSTER_FAILED, error_fields + f", status_code={response.status}")
 
-    def _make_call(self, type: str, url: str, payload: list[dict]=[]) -> dict:
+    async def _make_call(self, type: str, url: str, payload: list[dict]=[]) -> dict:
         """
         Makes a request call and handles the response
 
@@ -94,20 +170,50 @@ class GanksterAPI:
         Raises:
             CryoBotError: If issue occurs
         """
-        if type == "GET":
-            response = requests.get(url, headers=self._headers)
-            return self._handle_response(response, f"type='GET', url='{url}'")
-        if type == "DELETE":
-            response = requests.delete(url, headers=self._headers)
-            return self._handle_response(response, f"type='DELETE', url='{url}'")
-        if type == "POST":
-            response = requests.post(url, headers=self._headers, json=payload)
-            return self._handle_response(response, f"type='POST', url='{url}', payload={payload}")
-        if type == "PATCH":
-            response = requests.patch(url, headers=self._headers, json=payload)
-            return self._handle_response(response, f"type='PATCH', url='{url}', payload={payload}")
-
-    def _retrieve_outgoing_public_scrims(self, team: Team) -> list[Scrim]:
+        if not self._bearer_is_valid():
+            await self.refresh_bearer()
+
+        if type == "GET" or type == "DELETE":
+            payload = None
+            error_fields = f"type='{type}', url='{url}'"
+        else:
+            error_fields = f"type='{type}', url='{url}', payload={payload}"
+
+        rate_limit = self._rate_limits[self._endpoint_class(url)]
+        attempt = 0
+        reauthorized = False
+        while True:
+            await rate_limit.acquire()
+            bearer = self._bearer
+            async with self._get_session().request(type, url, headers=self._headers, json=payload) as response:
+                if response.status == 401 and not reauthorized:
+                    reauthorized = True
+                elif response.status == 429 and attempt < GANKSTER_MAX_RETRIES:
+                    retry_after = parse_retry_after(response.headers.get("Retry-After"), 2 ** attempt)
+                    attempt += 1
+                else:
+                    return await self._handle_response(response, error_fields)
+            if response.status == 401:
+                debugPrint(f"Gankster Bearer Rejected, Refreshing And Retrying: {error_fields}")
+                await self._refresh_stale_bearer(bearer)
+            else:
+                debugPrint(f"Gankster Rate Limited, Retrying In {retry_after}s: {error_fields}")
+                rate_limit.pause(retry_after)
+
+    def _endpoint_class(self, url: str) -> str:
+        """Returns which GANKSTER_RATE_LIMITS budget the given url is rate limited under"""
+        path = url.removeprefix("https://lol.gankster.gg/api/v1/")
+        if path.startswith("chats/"):
+            return "chats"
+        if path.startswith("events"):
+            return "events"
+        if path.startswith("teams/"):
+            return "teams"
+        if path.startswith("lol/player/"):
+            return "player"
+        return "default"
+
+    async def _retrieve_outgoing_public_scrims(self, team: Team) -> list[Scrim]:
         """
         Retrieves a list of scrim requests the team has sent out visible to the public (open/booked)
         If the team is Cryobark it will ignore booked scrims
@@ -125,10 +231,10 @@ class GanksterAPI:
             if not team.name:
                 team = CRYOBARK
             else:
-                team.number = self._retrieve_team_number(team.name)
+                team.number = await self._retrieve_team_number(team.name)
 
         url = f"https://lol.gankster.gg/api/v1/events/public/{team.number}" #TestingT (107750)  Rndm (112630)
-        response = self._make_call("GET", url)
+        response = await self._make_call("GET", url)
 
         scrims = []
 
@@ -140,38 +246,59 @@ class GanksterAPI:
 
         return scrims
 
-    def retrieve_booked_scrims(self) -> list[Scrim]:
+    async def retrieve_scrim_chats(self) -> ScrimChats:
         """
-        Retrieves a list of Cryobark's booked scrims
+        Retrieves Cryobark's scrim chats once and parses the incoming requests, outgoing requests, and booked scrims from it
 
         Returns:
-            list[Scrim]: The list of booked scrims
+            ScrimChats: The incoming requests, outgoing requests, and booked scrims with filled in teams
 
         Raises:
             CryoBotError: If issue occurs
         """
         url = "https://lol.gankster.gg/api/v1/chats/scrim"
-        response = self._make_call("GET", url)
-   
-        scrims = []
+        response = await self._make_call("GET", url)
+
+        chats = ScrimChats(incoming_requests=[], outgoing_requests=[], booked_scrims=[])
+        now = datetime.now()
 
         for result in response["results"]:
-            if result["type"] == "SCRIM" and result["event"]["status"] == "CONFIRMED" and Scrim.timestamp_to_datetime(result["event"]["endTime"]) > datetime.now():
-                if result["event"]["requesterId"] == CRYOBARK.number:
-                    team = "teamB"
-                else:
-                    team = "teamA"
-                scrims.append(Scrim(Scrim.timestamp_to_datetime(result["event"]["startTime"]), ScrimFormat.from_gankster_format(result["event"]["format"]["bestOf"]),
-                                    team=self._parse_team(result["event"][team]["team"]), open=False, gankster_id=result["event"]["id"]))
+            if result["type"] != "SCRIM" or Scrim.timestamp_to_datetime(result["event"]["endTime"]) <= now:
+                continue
+            event = result["event"]
+            sent_by_cryobark = event["requesterId"] == CRYOBARK.number
+            time = Scrim.timestamp_to_datetime(event["startTime"])
+            scrim_format = ScrimFormat.from_gankster_format(event["format"]["bestOf"])
 
-        return scrims
+            if event["status"] == "CONFIRMED":
+                team = "teamB" if sent_by_cryobark else "teamA"
+                chats.booked_scrims.append(Scrim(time, scrim_format, team=self._parse_team(event[team]["team"]), open=False, gankster_id=event["id"]))
+            elif event["status"] == "REQUESTED" and sent_by_cryobark:
+                chats.outgoing_requests.append(Scrim(time, scrim_format, team=self._parse_team(event["teamB"]["team"]), open=True, gankster_id=event["id"]))
+            elif event["status"] == "REQUESTED":
+                chats.incoming_requests.append(Scrim(time, scrim_format, team=self._parse_team(event["teamA"]["team"]), open=True, gankster_id=event["id"]))
+
+        return chats
+
+    async def retrieve_booked_scrims(self) -> list[Scrim]:
+        """
+        Retrieves a list of Cryobark's booked scrims
+
+        Returns:
+            list[Scrim]: The list of booked scrims
+
+        Raises:
+            CryoBotError: If issue occurs
+        """
+        return (await self.retrieve_scrim_chats()).booked_scrims
 
-    def retrieve_outgoing_scrims(self, team: Team) -> list[Scrim]:
+    async def retrieve_outgoing_scrims(self, team: Team, booked_scrims: list[Scrim]=None) -> list[Scrim]:
         """
         Retrieves a list of scrim requests the team has sent out
 
         Args:
             team (Team): The team to view outgoing scrims for
+            booked_scrims (list[Scrim]): Cryobark's already retrieved booked scrims, retrieved if not given
 
         Returns:
             list[Scrim]: The list of outgoing scrim requests, team unknown if not for Cryobark
@@ -179,12 +306,14 @@ class GanksterAPI:
         Raises:
             CryoBotError: If issue occurs
         """
-        public_scrims = self._retrieve_outgoing_public_scrims(team)
+        public_scrims = await self._retrieve_outgoing_public_scrims(team)
 
         if team != CRYOBARK:
             return public_scrims
 
-        booked_scrims = self.retrieve_booked_scrims()
+        if booked_scrims is None:
+            booked_scrims = await self.retrieve_booked_scrims()
+        booked_scrims = list(booked_scrims)
 
         for public_scrim in public_scrims:
             if not public_scrim.open:
@@ -194,7 +323,7 @@ class GanksterAPI:
 
         return public_scrims
 
-    def retrieve_incoming_scrim_requests(self) -> list[Scrim]:
+    async def retrieve_incoming_scrim_requests(self) -> list[Scrim]:
         """
         Retrieves a list of incoming scrim requests for Cryobark
 
@@ -204,19 +333,9 @@ class GanksterAPI:
         Raises:
             CryoBotError: If issue occurs
         """
-        url = "https://lol.gankster.gg/api/v1/chats/scrim"
-        response = self._make_call("GET", url)
-
-        scrims = []
-        for result in response["results"]:
-            if (result["type"] == "SCRIM" and result["event"]["status"] == "REQUESTED" and result["event"]["requesterId"] != CRYOBARK.number
-                and Scrim.timestamp_to_datetime(result["event"]["endTime"]) > datetime.now()):
-                scrims.append(Scrim(Scrim.timestamp_to_datetime(result["event"]["startTime"]), ScrimFormat.from_gankster_format(result["event"]["format"]["bestOf"]),
-                                    team=self._parse_team(result["event"]["teamA"]["team"]), open=True, gankster_id=result["event"]["id"]))
+        return (await self.retrieve_scrim_chats()).incoming_requests
 
-        return scrims
-
-    def retrieve_outgoing_scrim_requests(self) -> list[Scrim]:
+    async def retrieve_outgoing_scrim_requests(self) -> list[Scrim]:
         """
         Retrieves a list of outgoing scrim requests from Cryobark
 
@@ -226,21 +345,11 @@ class GanksterAPI:
         Raises:
             CryoBotError: If issue occurs
         """
-        url = "https://lol.gankster.gg/api/v1/chats/scrim"
-        response = self._make_call("GET", url)
+        return (await self.retrieve_scrim_chats()).outgoing_requests
 
-        scrims = []
-        for result in response["results"]:
-            if (result["type"] == "SCRIM" and result["event"]["status"] == "REQUESTED" and result["event"]["requesterId"] == CRYOBARK.number
-                and Scrim.timestamp_to_datetime(result["event"]["endTime"]) > datetime.now()):
-                scrims.append(Scrim(Scrim.timestamp_to_datetime(result["event"]["startTime"]), ScrimFormat.from_gankster_format(result["event"]["format"]["bestOf"]),
-                                    team=self._parse_team(result["event"]["teamB"]["team"]), open=True, gankster_id=result["event"]["id"]))
-
-        return scrims
-
-    def fill_team_stats(self, team: Team) -> None:
+    async def fill_team_stats(self, team: Team) -> None:
         """
-        Fills in the stats for the given team based on team number
+        Fills in the stats for the given team based on team number, using the team cache if possible
 
         Args:
             team (Team): the team class to fill in with the new stats
@@ -251,25 +360,28 @@ class GanksterAPI:
         Raises:
             CryoBotError: If issue occurs
         """
-        if team.number:
-            url = f"https://lol.gankster.gg/api/v1/teams/{team.number}"
-            response = self._make_call("GET", url)
-
-            team.copy(self._parse_team(response))
-        elif team.name:
-            url = f"https://lol.gankster.gg/api/v1/teams/search_advanced?query={team.name}"
-            response = self._make_call("GET", url)
+        cached_team = self._get_cached_team(team)
+        if cached_team:
+            team.copy(cached_team)
+            return
 
-            if not len(response["results"]):
-                raise CryoBotError(ErrorName.TEAM_NOT_FOUND, f"team={team}")
+        team_number = team.number or self._lookup_team_number(team.name)
+        if team_number:
+            url = f"https://lol.gankster.gg/api/v1/teams/{team_number}"
+            response = await self._make_call("GET", url)
 
-            team.copy(self._parse_team(response["results"][0]["team"]))
+            found_team = self._parse_team(response)
+            self._cache_team(found_team)
+        elif team.name:
+            found_team = await self._search_team(team.name)
         else:
             raise CryoBotError(ErrorName.INVALID_TEAM, f"team={team}")
 
-    def _retrieve_team_number(self, team_name) -> int:
+        team.copy(found_team)
+
+    async def _retrieve_team_number(self, team_name) -> int:
         """
-        Retrieves the team number from the given team name
+        Retrieves the team number from the given team name, using the team cache or team index if possible
 
         Args:
         team_name (str): the team's name to search for
@@ -277,18 +389,78 @@ class GanksterAPI:
         Returns:
             int: the team's team number
 
+        Raises:
+            CryoBotError: If issue occurs
+        """
+        team_number = self._lookup_team_number(team_name)
+        if team_number:
+            return team_number
+
+        return (await self._search_team(team_name)).number
+
+    def _lookup_team_number(self, team_name: str) -> int:
+        """Looks up the team number for the given name in the team cache then the team index without searching gankster, 0 if unknown"""
+        if not team_name:
+            return 0
+        return self._team_cache.get(("name", normalizeTeamName(team_name))) or self._team_index.get(team_name)
+
+    async def _search_team(self, team_name: str) -> Team:
+        """
+        Searches gankster for the given team name, caching the best match and indexing the searched name as one of its aliases
+
+        Args:
+            team_name (str): the team's name to search for
+
+        Returns:
+            Team: The best match for the given team name
+
         Raises:
             CryoBotError: If issue occurs
         """
         url = f"https://lol.gankster.gg/api/v1/teams/search_advanced?query={team_name}"
-        response = self._make_call("GET", url)
+        response = await self._make_call("GET", url)
 
         if not len(response["results"]):
             raise CryoBotError(ErrorName.TEAM_NOT_FOUND, f"team_name={team_name}")
 
-        return response["results"][0]["team"]["id"]
+        team = self._parse_team(response["results"][0]["team"])
+        self._cache_team(team, team_name)
+        self._team_index.add(team.number, team_name)
+        return team
+
+    def _get_cached_team(self, team: Team) -> Team:
+        """Returns the cached team matching the given team's number or name, None if not cached"""
+        team_number = team.number or self._lookup_team_number(team.name)
+        if not team_number:
+            return None
+        return self._team_cache.get(("number", team_number))
+
+    def _cache_team(self, team: Team, *aliases: str) -> None:
+        """Caches a copy of the given team under its number, and its name and any aliases it was searched by"""
+        if not team.number:
+            return
+        cached_team = Team()
+        cached_team.copy(team)
+        self._team_cache.set(("number", team.number), cached_team)
+        for name in (team.name, *aliases):
+            if name:
+                self._team_cache.set(("name", normalizeTeamName(name)), team.number)
+
+    def invalidate_team(self, team: Team) -> None:
+        """
+        Removes the given team from the team cache so its stats are retrieved again next time
 
-    def fill_player_stats(self, player: Player) -> None:
+        Args:
+            team (Team): The team to remove, by number or name
+
+        Returns:
+            None
+        """
+        team_number = team.number or self._lookup_team_number(team.name)
+        if team_number:
+            self._team_cache.pop(("number", team_number))
+
+    async def fill_player_stats(self, player: Player) -> None:
         """
         Fills in the stats for the given player based on puuid
 
@@ -307,12 +479,12 @@ class GanksterAPI:
             player.server = "NA"
 
         url = f"https://lol.gankster.gg/api/v1/lol/player/data/stats?puuid={player.puuid}&server={player.server}"
-        response = self._make_call("GET", url)
+        response = await self._make_call("GET", url)
 
         player.copy(self._parse_player(response["player"]))
 
 
-    def process_scrim_request(self, scrim: Scrim, accept:bool=True) -> bool:
+    async def process_scrim_request(self, scrim: Scrim, accept:bool=True) -> bool:
         """
         Accepts/Declines the given scrim request
 
@@ -326,7 +498,7 @@ class GanksterAPI:
         Raises:
             CryoBotError: If issue occurs
         """
-        scrims = self.retrieve_incoming_scrim_requests()
+        scrims = await self.retrieve_incoming_scrim_requests()
 
         found = False
         for i in range(len(scrims)):
@@ -350,9 +522,9 @@ class GanksterAPI:
                 "eventType": "SCRIM",
                 "status": "REJECTED"
             }
-        self._make_call("PATCH", url, payload)
+        await self._make_call("PATCH", url, payload)
 
-    def create_scrim_request(self, scrim: Scrim) -> None:
+    async def create_scrim_request(self, scrim: Scrim) -> None:
         """
         Creates a scrim request
 
@@ -370,9 +542,9 @@ class GanksterAPI:
             "isNow": False,
             "isPublic": True,
             "startTime": scrim.get_scrim_start_time_unix()}]
-        self._make_call("POST", url, payload)
+        await self._make_call("POST", url, payload)
 
-    def cancel_scrim_request(self, scrim: Scrim) -> None:
+    async def cancel_scrim_request(self, scrim: Scrim) -> None:
         """
         Cancels an outgoing scrim request
 
@@ -382,7 +554,7 @@ class GanksterAPI:
         Raises:
             CryoBotError: If issue occurs
         """
-        scrims = self._retrieve_outgoing_public_scrims(CRYOBARK)
+        scrims = await self._retrieve_outgoing_public_scrims(CRYOBARK)
 
         found = False
         for i in range(len(scrims)):
@@ -393,9 +565,9 @@ class GanksterAPI:
             raise CryoBotError(ErrorName.NO_SCRIM_BLOCK_FOUND, f"scrim={scrim}")
 
         url = f"https://lol.gankster.gg/api/v1/events/{scrims[i].gankster_id}"
-        self._make_call("DELETE", url)
+        await self._make_call("DELETE", url)
 
-    def cancel_scrim_block(self, scrim: Scrim, msg: str) -> None:
+    async def cancel_scrim_block(self, scrim: Scrim, msg: str) -> None:
         """
         Cancels a confirmed scrim block
 
@@ -405,7 +577,7 @@ class GanksterAPI:
         Raises:
             CryoBotError: If issue occurs
         """
-        scrims = self.retrieve_booked_scrims()
+        scrims = await self.retrieve_booked_scrims()
 
         found = False
         for i in range(len(scrims)):
@@ -422,9 +594,9 @@ class GanksterAPI:
             "status": "CANCELED"
         }
 
-        self._make_call("PATCH", url, payload)
+        await self._make_call("PATCH", url, payload)
 
-    def send_scrim_request(self, scrim: Scrim) -> None:
+    async def send_scrim_request(self, scrim: Scrim) -> None:
         """
         Sends a scrim request
 
@@ -436,11 +608,11 @@ class GanksterAPI:
         """
         if not scrim.team.number:
             if scrim.team.name:
-                scrim.team.number = self._retrieve_team_number(scrim.team.name)
+                scrim.team.number = await self._retrieve_team_number(scrim.team.name)
             else:
                 raise CryoBotError(ErrorName.INVALID_TEAM, f"team={scrim.team}")
 
-        scrim_requests = self._retrieve_outgoing_public_scrims(scrim.team)
+        scrim_requests = await self._retrieve_outgoing_public_scrims(scrim.team)
         lfs_id = ""
         for scrim_request in scrim_requests:
             if scrim_request.open:
@@ -459,9 +631,9 @@ class GanksterAPI:
             "startTime": scrim.get_scrim_start_time_unix()
         }
 
-        self._make_call("POST", url, payload)
+        await self._make_call("POST", url, payload)
 
-    def update_team_players(self, team: Team) -> None:
+    async def update_team_players(self, team: Team) -> None:
         """
         Fills in the stats for the given team and updatees players
 
@@ -474,13 +646,15 @@ class GanksterAPI:
         Raises:
             CryoBotError: If issue occurs
         """
-        self.fill_team_stats(team)
+        self.invalidate_team(team)
+        await self.fill_team_stats(team)
         for player in team.roster:
             if player.last_updated < datetime.now() - timedelta(hours=24):
-                try: self._update_player(player)
+                try: await self._update_player(player)
                 except CryoBotError as e: debugPrint(f"Failed to update player: {player.name}")
+        self.invalidate_team(team)
 
-    def _update_player(self, player: Player) -> None:
+    async def _update_player(self, player: Player) -> None:
         """Updates the given player on gankster and fills in their new stats"""
         if not player.puuid:
             raise CryoBotError(ErrorName.INVALID_PLAYER, f"player={player}")
@@ -492,11 +666,12 @@ class GanksterAPI:
             "puuid": player.puuid,
             "server": player.server
         }
-        response = self._make_call("PATCH", url, payload)
+        response = await self._make_call("PATCH", url, payload)
         player.copy(response["player"])
 
     def _parse_team(self, team: dict) -> Team:
-        """Pareses the retrieved json team and returns value"""
+        """Pareses the retrieved json team, adds it to the team index, and returns value"""
+        self._team_index.add(team.get("id", 0), team.get("name", ""))
         return Team(number=team.get("id", 0), name=team.get("name", ""), rank=GanksterRank.from_gankster_rank(team.get("lolRank")), region=team.get("lolServer", ""), bio=team.get("bio", ""),
              roster=self._parse_players(team.get("lolRoster", [])), opggLink=team.get("opggLink", ""), created=Scrim.timestamp_to_datetime(team.get("createdAt", 0)),
              reputation=self._parse_reputation(team.get("reputation")), logo_url=team.get("logo", ""))
@@ -531,7 +706,4 @@ class GanksterAPI:
             return Reputation()
         return Reputation(gank_rep=reputation.get("rating", 0), likes=reputation.get("posTotalCount", 0), dislikes=reputation.get("negTotalCount", 0), response_time=ResponseTime(reputation.get("responseTimeSec", 0)),
                           cancellation_rate=reputation.get("cancellationRate", 0), response_rate=reputation.get("responseRate", 0), communication=reputation.get("feedbackCommunicationScore", 0), behavior=reputation.get("feedbackBehaviorScore", 0),
-                          on_time=reputation.get("feedbackOnTimeScore", 0))
-
-a = GanksterAPI().retrieve_incoming_scrim_requests()
-print()
\ No newline at end of file
+                          on_time=reputation.get("feedbackOnTimeScore", 0))
\ No newline at end of file
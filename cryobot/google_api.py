@@ -1,6 +1,8 @@
+import asyncio
 import os
 import pathlib
 import subprocess
+from datetime import datetime, timedelta, timezone
 
 from aiohttp import ClientSession
 from google.auth.transport.requests import Request
@@ -15,22 +17,53 @@ GOOGLE_SCOPES: list[str] = getVariable("GOOGLE_SCOPES")
 CLIENT_ID: int = getVariable("CLIENT_ID")
 CLIENT_SECRET: str = getVariable("CLIENT_SECRET")
 GOOGLE_URL: str = getVariable("GOOGLE_URL")
+GOOGLE_REFRESH_MARGIN: int = getVariable("GOOGLE_REFRESH_MARGIN")
+GOOGLE_MISSING_FUNCTION: str = getVariable("GOOGLE_MISSING_FUNCTION")
 
 class GoogleAPI:
     """
     Handles everything to do with making calls to the Cryobark google script
 
     Script manages the Scrim Results google sheet and Scouting Reports google doc
+    Creds are loaded and refreshed in a worker thread so a slow refresh never blocks the event loop, and once loaded
+    they are refreshed in the background GOOGLE_REFRESH_MARGIN seconds before they expire
     """
     def __init__(self):
-        self._creds = self._get_creds()
+        self._creds: Credentials = None
+        self._creds_refresh: asyncio.Task = None
+        self._creds_refresher: asyncio.Task = None
+        self._headers: dict[str, str] = {}
         self._session: ClientSession = None
 
     def __del__(self):
         if self._session:
             self._session.close()
 
+    async def start(self) -> None:
+        """
+        Loads the creds and starts refreshing them before they expire
+
+        Returns:
+            None
+        """
+        await self.refresh_creds()
+
+    async def close(self) -> None:
+        """
+        Closes the session and stops refreshing the creds, both will restart if another call is made
+
+        Returns:
+            None
+        """
+        if self._creds_refresher:
+            self._creds_refresher.cancel()
+            self._creds_refresher = None
+        if self._session:
+            await self._session.close()
+            self._session = None
+
     def _get_creds(self) -> Credentials:
+        """Loads the saved creds and refreshes them if they expired, blocks so must be run in a thread"""
         creds = None
         # If credits present
         if os.path.exists('google_auth_token.json'):
@@ -43,11 +76,33 @@ class GoogleAPI:
                 except: return None
             else:
                 return None
-            with open('google_auth_token.json', 'w') as token_file:
-                token_file.write(creds.to_json())
-        self._headers = {"Authorization": f"Bearer {creds.token}","Content-Type": "application/json"}
+            self._save_creds(creds)
+        return creds
+
+    def _refresh_and_save_creds(self, creds: Credentials) -> Credentials:
+        """Refreshes the given creds and saves them, blocks so must be run in a thread"""
+        creds.refresh(Request())
+        self._save_creds(creds)
         return creds
 
+    def _save_creds(self, creds: Credentials) -> None:
+        """Writes the creds to the token file"""
+        with open('google_auth_token.json', 'w') as token_file:
+            token_file.write(creds.to_json())
+
+    def _set_creds(self, creds: Credentials) -> None:
+        """Swaps in new creds, the headers are replaced in one assignment so a call never sees half updated headers"""
+        self._creds = creds
+        self._headers = {"Authorization": f"Bearer {creds.token}","Content-Type": "application/json"} if creds else {}
+
+    def _creds_expiry(self) -> datetime:
+        """Returns when the creds expire in utc, datetime.max if google didn't say"""
+        return self._creds.expiry or datetime.max
+
+    def _creds_are_valid(self) -> bool:
+        """Returns whether there are creds that haven't expired"""
+        return bool(self._creds) and self._creds_expiry() > datetime.now(timezone.utc).replace(tzinfo=None)
+
     def setup_creds(self) -> None:
         """
         Opens a browser and goes to link to let the user authenticate
@@ -77,28 +132,49 @@ class GoogleAPI:
         ])
 
         # Update new creds and save to file
-        self._creds = flow.run_local_server(port=8080, open_browser=False, state=state)
-        self._headers = {"Authorization": f"Bearer {self._creds.token}","Content-Type": "application/json"}
-
-        with open('google_auth_token.json', 'w') as token_file:
-            token_file.write(self._creds.to_json())
+        self._set_creds(flow.run_local_server(port=8080, open_browser=False, state=state))
+        self._save_creds(self._creds)
 
     async def refresh_creds(self) -> None:
         """
-        Call occasionally to just keep auth going good and creds refreshed
+        Loads the creds until that works, refreshes them after that
+        If a refresh is already happening this waits on it instead of starting another
 
         Returns:
             None
         """
-        try:
-            self._creds.refresh(Request())
-            await self.refresh_creds()
-        except: pass
+        if not self._creds_refresh or self._creds_refresh.done():
+            self._creds_refresh = asyncio.create_task(self._retrieve_creds())
+        await asyncio.shield(self._creds_refresh)
+
+    async def _retrieve_creds(self) -> None:
+        """Loads the creds in a worker thread, or refreshes them once loaded, then schedules the next refresh"""
+        # Loading is tried again every time until it works, so a failed refresh at startup doesn't turn google off until a restart
+        if not self._creds:
+            self._set_creds(await asyncio.to_thread(self._get_creds))
+        else:
+            self._set_creds(await asyncio.to_thread(self._refresh_and_save_creds, self._creds))
+
+        if self._creds and (not self._creds_refresher or self._creds_refresher.done()):
+            self._creds_refresher = asyncio.create_task(self._refresh_creds_before_expiry())
+
+    async def _refresh_creds_before_expiry(self) -> None:
+        """Runs in the background refreshing the creds shortly before they expire, retrying every minute if it fails"""
+        while self._creds:
+            refresh_time = self._creds_expiry() - timedelta(seconds=GOOGLE_REFRESH_MARGIN)
+            await asyncio.sleep(max((refresh_time - datetime.now(timezone.utc).replace(tzinfo=None)).total_seconds(), 0))
+            try:
+                debugPrint("Refreshing Google Creds")
+                await self.refresh_creds()
+                debugPrint("Refreshing Google Creds Successful")
+            except Exception as e:
+                debugPrint(f"Failed to Refresh Google Creds: {e}")
+                await asyncio.sleep(60)
 
     def is_auth_setup(self) -> bool:
         return self._creds != None
 
-    async def _make_call(self, payload: dict) -> None:
+    async def make_call(self, payload: dict) -> None:
         """
         Makes an API call to the Cryobark google script
 
@@ -111,10 +187,75 @@ class GoogleAPI:
         Raises:
             CryoBotError: If issue occurs
         """
+        await self._post(payload)
+
+    async def make_batch_call(self, payloads: list[dict]) -> list[CryoBotError]:
+        """
+        Makes several API calls to the Cryobark google script in a single execution of the script's batch function
+
+        The batch function runs each call in order and returns {"error": message} for each one that failed, so one failing
+        call doesn't stop the rest. Only if the script has no batch function are the calls made one at a time instead,
+        any other failure may have happened partway through so the calls are left for the caller to retry.
+        A call the script returned no result for counts as failed since it may never have run.
+
+        Args:
+            payloads (list[dict]): The payloads for the api calls in the order they should be made
+
+        Returns:
+            list[CryoBotError]: The error the script returned for each payload in order, None for each one that succeeded
+
+        Raises:
+            CryoBotError: If the batch execution fails for any reason other than the batch function missing, so the calls can be retried
+            Exception: If the request itself fails so the calls can be retried
+        """
+        if len(payloads) == 1:
+            return [await self._make_call_for_error(payloads[0])]
+
+        batch_payload = {
+            "function": "batch",
+            "parameters": [[{"function": payload["function"], "parameters": payload.get("parameters", [])} for payload in payloads]],
+            "devMode": True
+        }
+        try:
+            response = await self._post(batch_payload)
+        except CryoBotError as e:
+            if e.name != ErrorName.UNKNOWN or GOOGLE_MISSING_FUNCTION not in e.description:
+                raise
+            debugPrint(f"Google Script Has No Batch Function, Making Calls One At A Time: {e}")
+            return [await self._make_call_for_error(payload) for payload in payloads]
+
+        if not response:
+            return [None] * len(payloads)
+        results = response["response"].get("result")
+        if not isinstance(results, list):
+            results = []
+        return [self._parse_result(results[i]) if i < len(results) else
+                CryoBotError(ErrorName.UNKNOWN, "", description=f"Batch returned no result for {payload['function']}, it may not have run")
+                for i, payload in enumerate(payloads)]
+
+    def _parse_result(self, result) -> CryoBotError:
+        """Returns the CryoBotError for a call's result from the batch function, None if it succeeded"""
+        if isinstance(result, dict) and result.get("error"):
+            return self._parse_error(str(result["error"]))
+        return None
+
+    async def _make_call_for_error(self, payload: dict) -> CryoBotError:
+        """Makes the call and returns the CryoBotError the script returned, None if it succeeded"""
+        try:
+            await self._post(payload)
+        except CryoBotError as e:
+            if e.name == ErrorName.AUTH_NOT_SETUP:
+                raise
+            return e
+
+    async def _post(self, payload: dict) -> dict:
+        """Posts the payload to the google script and returns the response, None if automatic google is off"""
         debugPrint(f"Making Google Call: payload={payload}")
         if not getVariable("AUTOMATIC_GOOGLE"):
             debugPrint("Exiting Google Because Automatic Google")
-            return
+            return None
+        if not self._creds_are_valid():
+            await self.refresh_creds()
         if not self.is_auth_setup():
             raise CryoBotError(ErrorName.AUTH_NOT_SETUP, fields="D:")
         if not self._session:
@@ -125,10 +266,15 @@ class GoogleAPI:
 
         if "error" in response:
             debugPrint("Error Making Google Call")
-            messages = response["error"]["details"][0]["errorMessage"].removeprefix("Error: ").split(": ")
-            if messages[0] in (e.value for e in ErrorName):
-                raise CryoBotError(ErrorName(messages[0]), messages[1])
-            raise CryoBotError(ErrorName.UNKNOWN, "", description=": ".join(messages))
+            raise self._parse_error(response["error"]["details"][0]["errorMessage"])
+        return response
+
+    def _parse_error(self, error_message: str) -> CryoBotError:
+        """Converts an error message thrown by the google script to a CryoBotError"""
+        messages = error_message.removeprefix("Error: ").split(": ")
+        if messages[0] in (e.value for e in ErrorName):
+            return CryoBotError(ErrorName(messages[0]), messages[1])
+        return CryoBotError(ErrorName.UNKNOWN, "", description=": ".join(messages))
 
     async def refresh_token(self) -> None:
         """
@@ -144,7 +290,7 @@ class GoogleAPI:
             "function": "refreshToken",
             "devMode": True
         }
-        await self._make_call(payload)
+        await self.make_call(payload)
 
     async def found_scrim(self, scrim: Scrim) -> None:
         """
@@ -160,13 +306,15 @@ class GoogleAPI:
         Raises:
             CryoBotError: If issue occurs
         """
+        await self.make_call(self.found_scrim_payload(scrim))
 
-        payload = {
+    def found_scrim_payload(self, scrim: Scrim) -> dict:
+        """Returns the payload for found_scrim so it can be queued with GoogleQueue"""
+        return {
             "function": "foundScrim",
             "parameters": [scrim.team.name, scrim.team.number, scrim.team.opggLink, scrim.time.strftime("%m/%d/%Y"), scrim.scrim_format.games, scrim.scrim_format.format_long],
             "devMode": True
         }
-        await self._make_call(payload)
 
     async def cancel_scrim(self, scrim: Scrim) -> None:
         """
@@ -181,13 +329,15 @@ class GoogleAPI:
         Raises:
             CryoBotError: If issue occurs
         """
+        await self.make_call(self.cancel_scrim_payload(scrim))
 
-        payload = {
+    def cancel_scrim_payload(self, scrim: Scrim) -> dict:
+        """Returns the payload for cancel_scrim so it can be queued with GoogleQueue"""
+        return {
             "function": "cancelScrim",
             "parameters": [scrim.team.name, scrim.time.strftime("%m/%d/%Y")],
             "devMode": True
         }
-        await self._make_call(payload)
 
     async def update_scrim_results(self) -> None:
         """
@@ -202,12 +352,14 @@ class GoogleAPI:
         Raises:
             CryoBotError: If issue occurs
         """
+        await self.make_call(self.update_scrim_results_payload())
 
-        payload = {
+    def update_scrim_results_payload(self) -> dict:
+        """Returns the payload for update_scrim_results so it can be queued with GoogleQueue"""
+        return {
             "function": "updateScrimResults",
             "devMode": True
         }
-        await self._make_call(payload)
 
     async def reset_scrim_results_data(self) -> None:
         """
@@ -227,7 +379,7 @@ class GoogleAPI:
             "function": "resetScrimResultsData",
             "devMode": True
         }
-        await self._make_call(payload)
+        await self.make_call(payload)
 
     async def reset_scouting_scrim_results(self) -> None:
         """
@@ -247,7 +399,7 @@ class GoogleAPI:
             "function": "resetScoutingScrimResults",
             "devMode": True
         }
-        await self._make_call(payload)
+        await self.make_call(payload)
 
 if __name__ == "__main__":
     GoogleAPI().setup_creds()
\ No newline at end of file
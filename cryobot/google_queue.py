@@ -0,0 +1,166 @@
+import asyncio
+import json
+import sqlite3
+import time
+from typing import Awaitable, Callable
+
+from helper import debugPrint, getVariable
+from scrim_classes import CryoBotError
+
+DATABASE_FILE: str = getVariable("DATABASE_FILE")
+GOOGLE_MAX_RETRIES: int = getVariable("GOOGLE_MAX_RETRIES")
+GOOGLE_RETRY_DELAY: int = getVariable("GOOGLE_RETRY_DELAY")
+GOOGLE_BATCH_SIZE: int = getVariable("GOOGLE_BATCH_SIZE")
+
+class GoogleQueue:
+    """
+    Durable write-behind queue for calls to the Cryobark google script, stored in DATABASE_FILE
+
+    Callers queue a payload and return right away while a background worker makes the calls, so nothing waits on apps script.
+    Every call that's due is sent together, up to GOOGLE_BATCH_SIZE per script execution, since starting the script is the slow part.
+    Calls sharing a key are made in the order they were queued, a failed call is retried with backoff and holds back
+    the calls queued after it with the same key, while calls with other keys keep going. Queued calls survive a restart.
+    Errors the script itself returns are reported and dropped instead of retried since trying again won't fix them,
+    anything else, including creds that are missing for now, retries the whole batch.
+
+    Calls that haven't been made yet are coalesced with the last call waiting under the same key: a repeat of it is dropped,
+    and a call that cancels it out removes both, so a scrim booked then cancelled before the worker gets to it costs nothing.
+    """
+    def __init__(self, make_batch_call: Callable[[list[dict]], Awaitable[list[CryoBotError]]], on_error: Callable[[Exception], None]=None, path: str=DATABASE_FILE):
+        self._make_batch_call = make_batch_call
+        self._on_error = on_error
+        self._path: str = path
+        self._connection: sqlite3.Connection = None
+        self._wakeup = asyncio.Event()
+        self._worker: asyncio.Task = None
+        self._in_flight: set[int] = set()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Opens the database if it hasn't been yet"""
+        if not self._connection:
+            self._connection = sqlite3.connect(self._path)
+            self._connection.execute("CREATE TABLE IF NOT EXISTS google_calls (id INTEGER PRIMARY KEY AUTOINCREMENT, call_key TEXT NOT NULL, "
+                                     "payload TEXT NOT NULL, attempts INTEGER NOT NULL DEFAULT 0, next_attempt REAL NOT NULL DEFAULT 0)")
+        return self._connection
+
+    def __len__(self) -> int:
+        return self._connect().execute("SELECT COUNT(*) FROM google_calls").fetchone()[0]
+
+    def enqueue(self, key: str, payload: dict, cancels: dict=None, debounce: float=0) -> None:
+        """
+        Queues a call to the google script, coalescing it with the last call waiting under the same key
+
+        Args:
+            key (str): Calls with the same key are made in order, usually the scrim the call is for
+            payload (dict): The payload for the call
+            cancels (dict): The payload of a call this one undoes, if that's the last call waiting both are dropped
+            debounce (float): Seconds to hold the call so repeats queued in that time are made once, each repeat restarts the wait
+
+        Returns:
+            None
+        """
+        connection = self._connect()
+        next_attempt = time.time() + debounce
+        last = connection.execute("SELECT id, payload FROM google_calls WHERE call_key = ? ORDER BY id DESC LIMIT 1", (key,)).fetchone()
+        if last and last[0] not in self._in_flight:
+            last_id, last_payload = last[0], json.loads(last[1])
+            if last_payload == payload:
+                debugPrint(f"Coalescing Repeated Google Call: payload={payload}")
+                with connection:
+                    connection.execute("UPDATE google_calls SET next_attempt = MAX(next_attempt, ?) WHERE id = ?", (next_attempt, last_id))
+                return
+            if cancels is not None and last_payload == cancels:
+                debugPrint(f"Dropping Google Call Cancelled Out By: payload={payload}")
+                with connection:
+                    connection.execute("DELETE FROM google_calls WHERE id = ?", (last_id,))
+                return
+        with connection:
+            connection.execute("INSERT INTO google_calls (call_key, payload, next_attempt) VALUES (?, ?, ?)", (key, json.dumps(payload), next_attempt))
+        self._wakeup.set()
+
+    def start(self) -> None:
+        """Starts the background worker if it isn't already running, calls left from before a restart are made first"""
+        if not self._worker or self._worker.done():
+            self._worker = asyncio.create_task(self._work())
+
+    async def _work(self) -> None:
+        """Makes queued calls forever, sleeping until something is queued or a retry is due"""
+        while True:
+            self._wakeup.clear()
+            delay = await self._drain()
+            try: await asyncio.wait_for(self._wakeup.wait(), delay)
+            except asyncio.TimeoutError: pass
+
+    async def _drain(self) -> float:
+        """Makes every call that's due in batches, returning how many seconds until the next retry or None if there isn't one"""
+        while True:
+            batch, next_retry = self._next_batch()
+            if not batch:
+                return None if next_retry is None else max(next_retry - time.time(), 0)
+            await self._make_batch(batch)
+
+    def _next_batch(self) -> tuple[list[tuple[int, dict, int]], float]:
+        """Returns up to GOOGLE_BATCH_SIZE due calls in order as (id, payload, attempts) and when the soonest held back call is due"""
+        batch: list[tuple[int, dict, int]] = []
+        blocked: set[str] = set()
+        next_retry: float = None
+        for call_id, key, payload, attempts, next_attempt in self._connect().execute(
+                "SELECT id, call_key, payload, attempts, next_attempt FROM google_calls ORDER BY id"):
+            if key in blocked:
+                continue
+            if next_attempt > time.time():
+                blocked.add(key)
+                next_retry = min(next_retry or next_attempt, next_attempt)
+                continue
+            batch.append((call_id, json.loads(payload), attempts))
+            if len(batch) == GOOGLE_BATCH_SIZE:
+                break
+        return batch, next_retry
+
+    async def _make_batch(self, batch: list[tuple[int, dict, int]]) -> None:
+        """Makes the calls in a single script execution, retrying all of them later if the request fails"""
+        connection = self._connect()
+        self._in_flight = {call_id for call_id, _, _ in batch}
+        try:
+            errors = await self._make_batch_call([payload for _, payload, _ in batch])
+        except Exception as e:
+            with connection:
+                for call_id, _, attempts in batch:
+                    if attempts + 1 < GOOGLE_MAX_RETRIES:
+                        connection.execute("UPDATE google_calls SET attempts = ?, next_attempt = ? WHERE id = ?",
+                                           (attempts + 1, time.time() + GOOGLE_RETRY_DELAY * 2 ** attempts, call_id))
+                    else:
+                        debugPrint(f"Google Call Failed {GOOGLE_MAX_RETRIES} Times, Dropping It: {e}")
+                        connection.execute("DELETE FROM google_calls WHERE id = ?", (call_id,))
+                        self._report(e)
+            debugPrint(f"Google Calls Failed, Retrying Later: {e}")
+            return
+        finally:
+            self._in_flight = set()
+
+        with connection:
+            connection.executemany("DELETE FROM google_calls WHERE id = ?", [(call_id,) for call_id, _, _ in batch])
+        for error in errors:
+            if error:
+                debugPrint(f"Google Call Failed, Dropping It: {error}")
+                self._report(error)
+
+    def _report(self, e: Exception) -> None:
+        """Passes a dropped call's error to on_error if there is one"""
+        if self._on_error:
+            self._on_error(e)
+
+    async def close(self) -> None:
+        """
+        Stops the background worker and closes the database, anything still queued is made after the next start
+
+        Returns:
+            None
+        """
+        if self._worker:
+            self._worker.cancel()
+            await asyncio.wait([self._worker])
+            self._worker = None
+        if self._connection:
+            self._connection.close()
+            self._connection = None
@@ -23,7 +23,31 @@ constants = {
     "ALL_MEMBERS": {301513241807421440 ,306170246232801290, 277174048843235330, 301504795175550976, 267023049931358208, 465587770337918976, 145798980016537600},
     "CRYOBARK": Team(number=84830, name="Cryobark"),
     "WILDCARD_TEAM": Team(number=-1),
-    "UPDATE_VARIABLES": "update_vars.json"
+    "UPDATE_VARIABLES": "update_vars.json",
+    "GANKSTER_RATE_LIMITS": {"chats": (10, 60), "events": (20, 60), "teams": (30, 60), "player": (10, 60), "default": (20, 60)}, # (calls, seconds)
+    "GANKSTER_MAX_RETRIES": 3,
+    "GANKSTER_REFRESH_MARGIN": 300, # seconds
+    "TEAM_CACHE_SIZE": 256,
+    "TEAM_CACHE_TTL": 3600, # seconds
+    "DATABASE_FILE": "cryobot.db",
+    "SELENIUM_BROWSER": False,
+    "SCRIM_STATUS_INTERVALS": {"soon": 30, "active": 60, "idle": 300}, # seconds
+    "SCRIM_SOON_WINDOW": 7200, # seconds
+    "GOOGLE_MAX_RETRIES": 5,
+    "GOOGLE_RETRY_DELAY": 30, # seconds, doubled after each failed attempt
+    "GOOGLE_RESULTS_DEBOUNCE": 120, # seconds
+    "GOOGLE_BATCH_SIZE": 10,
+    "GOOGLE_REFRESH_MARGIN": 300, # seconds
+    "GOOGLE_MISSING_FUNCTION": "Script function not found", # start of the error apps script gives when a function doesn't exist
+    "RIOT_APP_RATE_LIMIT": "20:1,100:120", # development key limits until riot's headers say otherwise
+    "RIOT_MAX_RETRIES": 5,
+    "RIOT_REQUEST_TIMEOUT": 30, # seconds
+    "MATCH_CACHE_MAX_BYTES": 256 * 1024 * 1024,
+    "MATCH_CACHE_TOUCH_BATCH": 100, # cache hits held in memory before their access times are written
+    "RIOT_MATCH_CONCURRENCY": 10,
+    "RIOT_SYNC_OVERLAP": 7200, # seconds, longer than any game so games still being played during a sync are caught by the next one
+    "RIOT_CACHE_SIZES": {"account": 1024, "summoner": 1024, "league": 1024}, # entries of each kind kept before the least recently used is evicted
+    "RIOT_CACHE_TTLS": {"account": 604800, "summoner": 86400, "league": 900} # seconds
 }
 
 DEBUG_MODE: bool = constants["DEBUG_MODE"]
@@ -59,6 +83,10 @@ def setVariable(varName: str, value):
     update_variables[varName] = value
     _save_update_varaibles()
 
+def normalizeTeamName(name: str) -> str:
+    """Normalizes a team name so lookups ignore capitalization and surrounding/repeated whitespace"""
+    return " ".join(name.split()).casefold() if name else ""
+
 def ordinal(n):
     """Converts a number to the formated number ex. 1 to 1st"""
     return str(n)+("th" if 4<=n%100<=20 else {1:"st",2:"nd",3:"rd"}.get(n%10, "th"))
\ No newline at end of file
@@ -0,0 +1,110 @@
+import json
+import sqlite3
+import time
+import zlib
+
+from helper import getVariable
+
+DATABASE_FILE: str = getVariable("DATABASE_FILE")
+MATCH_CACHE_MAX_BYTES: int = getVariable("MATCH_CACHE_MAX_BYTES")
+MATCH_CACHE_TOUCH_BATCH: int = getVariable("MATCH_CACHE_TOUCH_BATCH")
+
+class MatchCache:
+    """
+    Persistent cache of riot matches keyed by match id, stored zlib compressed in DATABASE_FILE
+
+    A match never changes once it's over so entries never expire, instead the least recently used matches are evicted
+    once the compressed matches take up more than max_bytes. When a hit was last used is only held in memory and written
+    MATCH_CACHE_TOUCH_BATCH hits at a time, before evicting, or on close, so reading cached matches doesn't commit for each one
+    """
+    def __init__(self, path: str=DATABASE_FILE, max_bytes: int=MATCH_CACHE_MAX_BYTES):
+        self._path: str = path
+        self._max_bytes: int = max_bytes
+        self._connection: sqlite3.Connection = None
+        self._size: int = 0
+        self._touched: dict[str, float] = {}
+
+    def _connect(self) -> sqlite3.Connection:
+        """Opens the database and totals up the cache's size if it hasn't been yet"""
+        if not self._connection:
+            self._connection = sqlite3.connect(self._path)
+            self._connection.execute("CREATE TABLE IF NOT EXISTS riot_matches (match_id TEXT PRIMARY KEY, data BLOB NOT NULL, "
+                                     "size INTEGER NOT NULL, accessed REAL NOT NULL)")
+            self._connection.execute("CREATE INDEX IF NOT EXISTS riot_matches_accessed ON riot_matches (accessed)")
+            self._size = self._connection.execute("SELECT COALESCE(SUM(size), 0) FROM riot_matches").fetchone()[0]
+        return self._connection
+
+    def __contains__(self, match_id: str) -> bool:
+        return self._connect().execute("SELECT 1 FROM riot_matches WHERE match_id = ?", (match_id,)).fetchone() is not None
+
+    def __len__(self) -> int:
+        return self._connect().execute("SELECT COUNT(*) FROM riot_matches").fetchone()[0]
+
+    def get(self, match_id: str) -> dict:
+        """
+        Gets the cached match and marks it as recently used
+
+        Args:
+            match_id (str): The riot match id ex. NA1_1234567890
+
+        Returns:
+            dict: The MatchDTO, None if it isn't cached
+        """
+        connection = self._connect()
+        row = connection.execute("SELECT data FROM riot_matches WHERE match_id = ?", (match_id,)).fetchone()
+        if row is None:
+            return None
+        self._touched[match_id] = time.time()
+        if len(self._touched) >= MATCH_CACHE_TOUCH_BATCH:
+            self._flush_touched()
+        return json.loads(zlib.decompress(row[0]))
+
+    def _flush_touched(self) -> None:
+        """Writes when each match hit since the last flush was used in a single commit"""
+        if not self._touched:
+            return
+        connection = self._connect()
+        with connection:
+            connection.executemany("UPDATE riot_matches SET accessed = ? WHERE match_id = ?",
+                                   [(accessed, match_id) for match_id, accessed in self._touched.items()])
+        self._touched.clear()
+
+    def set(self, match_id: str, match: dict) -> None:
+        """
+        Caches the match, evicting the least recently used matches if the cache is now too big
+
+        Args:
+            match_id (str): The riot match id ex. NA1_1234567890
+            match (dict): The MatchDTO
+
+        Returns:
+            None
+        """
+        connection = self._connect()
+        data = zlib.compress(json.dumps(match, separators=(",", ":")).encode())
+        old_size = connection.execute("SELECT size FROM riot_matches WHERE match_id = ?", (match_id,)).fetchone()
+        with connection:
+            connection.execute("INSERT OR REPLACE INTO riot_matches VALUES (?, ?, ?, ?)", (match_id, data, len(data), time.time()))
+        self._size += len(data) - (old_size[0] if old_size else 0)
+        if self._size > self._max_bytes:
+            self._evict()
+
+    def _evict(self) -> None:
+        """Deletes the least recently used matches until the cache fits in max_bytes"""
+        self._flush_touched()
+        connection = self._connect()
+        evicted = []
+        for match_id, size in connection.execute("SELECT match_id, size FROM riot_matches ORDER BY accessed"):
+            if self._size <= self._max_bytes:
+                break
+            evicted.append((match_id,))
+            self._size -= size
+        with connection:
+            connection.executemany("DELETE FROM riot_matches WHERE match_id = ?", evicted)
+
+    def close(self) -> None:
+        """Closes the database connection, it will be reopened if the cache is used again"""
+        if self._connection:
+            self._flush_touched()
+            self._connection.close()
+            self._connection = None
@@ -0,0 +1,60 @@
+import sqlite3
+
+from helper import getVariable
+
+DATABASE_FILE: str = getVariable("DATABASE_FILE")
+
+class MatchSyncMarks:
+    """
+    Persistent high-water marks for each player's match history, stored in DATABASE_FILE
+
+    A mark is the newest match id seen for a puuid and queue and when that sync happened, so the next sync only asks riot for newer games
+    """
+    def __init__(self, path: str=DATABASE_FILE):
+        self._path: str = path
+        self._connection: sqlite3.Connection = None
+
+    def _connect(self) -> sqlite3.Connection:
+        """Opens the database if it hasn't been yet"""
+        if not self._connection:
+            self._connection = sqlite3.connect(self._path)
+            self._connection.execute("CREATE TABLE IF NOT EXISTS riot_sync_marks (puuid TEXT NOT NULL, queue INTEGER NOT NULL, "
+                                     "last_match_id TEXT NOT NULL, synced REAL NOT NULL, PRIMARY KEY (puuid, queue))")
+        return self._connection
+
+    def get(self, puuid: str, queue: int=None) -> tuple[str, float]:
+        """
+        Gets the mark for the given player and queue
+
+        Args:
+            puuid (str): The player's puuid
+            queue (int): The queue id, None for every queue
+
+        Returns:
+            tuple[str, float]: The newest synced match id and the epoch time of that sync, None if the player was never synced
+        """
+        return self._connect().execute("SELECT last_match_id, synced FROM riot_sync_marks WHERE puuid = ? AND queue = ?",
+                                       (puuid, queue or 0)).fetchone()
+
+    def set(self, puuid: str, queue: int, last_match_id: str, synced: float) -> None:
+        """
+        Moves the mark for the given player and queue
+
+        Args:
+            puuid (str): The player's puuid
+            queue (int): The queue id, None for every queue
+            last_match_id (str): The newest match id synced
+            synced (float): The epoch time the sync happened
+
+        Returns:
+            None
+        """
+        connection = self._connect()
+        with connection:
+            connection.execute("INSERT OR REPLACE INTO riot_sync_marks VALUES (?, ?, ?, ?)", (puuid, queue or 0, last_match_id, synced))
+
+    def close(self) -> None:
+        """Closes the database connection, it will be reopened if the marks are used again"""
+        if self._connection:
+            self._connection.close()
+            self._connection = None
@@ -0,0 +1,144 @@
+import asyncio
+import time
+from collections import deque
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+class TokenBucket:
+    """
+    Limits how often calls can be made, callers wait in order for a token instead of failing when the bucket is empty
+
+    Starts full so short bursts go through immediately, then refills at calls/seconds tokens per second
+    """
+    def __init__(self, calls: int, seconds: float):
+        self._capacity: float = calls
+        self._rate: float = calls / seconds
+        self._tokens: float = calls
+        self._updated: float = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        """Adds the tokens earned since the last refill"""
+        now = time.monotonic()
+        self._tokens = min(self._capacity, self._tokens + (now - self._updated) * self._rate)
+        self._updated = now
+
+    async def acquire(self) -> None:
+        """
+        Waits until a token is availible and takes it
+
+        Returns:
+            None
+        """
+        async with self._lock:
+            self._refill()
+            while self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self._rate)
+                self._refill()
+            self._tokens -= 1
+
+    def pause(self, seconds: float) -> None:
+        """
+        Empties the bucket so no tokens are handed out for at least the given amount of seconds
+
+        Args:
+            seconds (float): How long the server asked us to back off for
+
+        Returns:
+            None
+        """
+        self._refill()
+        self._tokens = min(self._tokens, 0) - seconds * self._rate
+
+class WindowRateLimit:
+    """
+    Limits calls against several windows at once, like riot's 20 calls per second and 100 calls per 2 minutes
+
+    The limits can be replaced as the server reports them, and when the server has counted more calls than we have its count is trusted
+    """
+    def __init__(self, limits: str=None):
+        self._windows: dict[float, tuple[int, deque[float]]] = {}
+        self._paused_until: float = 0
+        self._lock = asyncio.Lock()
+        self.update(limits)
+
+    def _prune(self, seconds: float, calls: deque[float], now: float) -> None:
+        """Drops the calls that have left the window"""
+        while calls and calls[0] <= now - seconds:
+            calls.popleft()
+
+    def update(self, limits: str, counts: str=None) -> None:
+        """
+        Updates the limits and counts from values formated like riot's rate limit headers
+
+        Args:
+            limits (str): The limits as "calls:seconds,calls:seconds", None to keep the current ones
+            counts (str): The server's counts as "calls:seconds,calls:seconds", None if it didn't send any
+
+        Returns:
+            None
+        """
+        if limits:
+            self._windows = {seconds: (calls, self._windows.get(seconds, (0, deque()))[1]) for calls, seconds in parse_rate_limits(limits)}
+        if counts:
+            now = time.monotonic()
+            for count, seconds in parse_rate_limits(counts):
+                if seconds in self._windows:
+                    calls = self._windows[seconds][1]
+                    self._prune(seconds, calls, now)
+                    calls.extend([now] * (count - len(calls)))
+
+    async def acquire(self) -> None:
+        """
+        Waits until every window has room for another call and counts it
+
+        Returns:
+            None
+        """
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                wait = self._paused_until - now
+                for seconds, (limit, calls) in self._windows.items():
+                    self._prune(seconds, calls, now)
+                    if len(calls) >= limit:
+                        wait = max(wait, calls[len(calls) - limit] + seconds - now)
+                if wait <= 0:
+                    break
+                await asyncio.sleep(wait)
+            for _, calls in self._windows.values():
+                calls.append(now)
+
+    def pause(self, seconds: float) -> None:
+        """
+        Stops handing out calls for at least the given amount of seconds
+
+        Args:
+            seconds (float): How long the server asked us to back off for
+
+        Returns:
+            None
+        """
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+def parse_rate_limits(limits: str) -> list[tuple[int, float]]:
+    """Parses a riot style rate limit header "20:1,100:120" into [(20, 1), (100, 120)], skipping anything malformed"""
+    parsed = []
+    for limit in (limits or "").split(","):
+        calls, _, seconds = limit.strip().partition(":")
+        try: parsed.append((int(calls), float(seconds)))
+        except ValueError: pass
+    return parsed
+
+def parse_retry_after(retry_after: str, default: float) -> float:
+    """Parses a Retry-After header that is either a number of seconds or an HTTP date, returning default if missing or invalid"""
+    if not retry_after:
+        return default
+    try:
+        return max(float(retry_after), 0)
+    except ValueError:
+        pass
+    try:
+        return max((parsedate_to_datetime(retry_after) - datetime.now(timezone.utc)).total_seconds(), 0)
+    except (TypeError, ValueError):
+        return default
@@ -1,93 +1,339 @@
-import requests
-from time import sleep
-from urllib.parse import urlencode
+import asyncio
+import time
+from typing import AsyncIterator
+from urllib.parse import urlparse
 
+from aiohttp import ClientError, ClientSession, ClientTimeout, TCPConnector
+
+from cache import TTLCache
 from helper import debugPrint, getVariable
+from match_cache import MatchCache
+from match_sync import MatchSyncMarks
+from rate_limiter import WindowRateLimit, parse_retry_after
+from scrim_classes import CryoBotError, ErrorName, RosterMatch, Team
 
 RIOT_API_KEY: str = getVariable("RIOT_API_KEY")
+RIOT_APP_RATE_LIMIT: str = getVariable("RIOT_APP_RATE_LIMIT")
+RIOT_MAX_RETRIES: int = getVariable("RIOT_MAX_RETRIES")
+RIOT_REQUEST_TIMEOUT: int = getVariable("RIOT_REQUEST_TIMEOUT")
+RIOT_MATCH_CONCURRENCY: int = getVariable("RIOT_MATCH_CONCURRENCY")
+RIOT_SYNC_OVERLAP: int = getVariable("RIOT_SYNC_OVERLAP")
+RIOT_CACHE_SIZES: dict[str, int] = getVariable("RIOT_CACHE_SIZES")
+RIOT_CACHE_TTLS: dict[str, int] = getVariable("RIOT_CACHE_TTLS")
 
 class RiotAPI:
-    param = {'api_key' : RIOT_API_KEY}
-
-    @staticmethod
-    def get(url, params, attempts=0):
-        rtn = requests.get(url, params=urlencode(params)).json()
-        if type(rtn) == dict and  'status' in rtn.keys():
-            retryCodes = [
-                429, # Rate Limit Exceeded
-                500, # Internal Server Error
-                503, # Service Unavailable
-            ]
-            if rtn['status']['status_code'] in retryCodes and attempts < 120:
-                sleep(.25)
-                return RiotAPI.get(url, params, attempts+1)
+    """
+    Handles everything to do with making calls to the riot api
+
+    Every region (americas, na1, etc.) has its own app rate limit and every method within a region its own method limit.
+    Both are learned from the X-App-Rate-Limit and X-Method-Rate-Limit headers and every request waits for room in both,
+    so bulk pulls run as fast as the key allows without going over. A 429 backs off for Retry-After, and a 500/503, a connection
+    error or a request taking longer than RIOT_REQUEST_TIMEOUT backs off exponentially, up to RIOT_MAX_RETRIES times
+
+    Account, summoner and league lookups each have their own cache, kept for as long as RIOT_CACHE_TTLS allows for that kind of data,
+    riot ids almost never change while ranks change a few times a day
+    """
+    retryCodes = [
+        429, # Rate Limit Exceeded
+        500, # Internal Server Error
+        503, # Service Unavailable
+    ]
+
+    def __init__(self):
+        self._session: ClientSession = None
+        self._app_limits: dict[str, WindowRateLimit] = {}
+        self._method_limits: dict[tuple[str, str], WindowRateLimit] = {}
+        self._match_cache = MatchCache()
+        self._sync_marks = MatchSyncMarks()
+        # Each kind gets its own cache so fast changing league entries never push out accounts that are good for a week
+        self._lookup_caches: dict[str, TTLCache] = {kind: TTLCache(RIOT_CACHE_SIZES[kind], ttl) for kind, ttl in RIOT_CACHE_TTLS.items()}
+
+    def _get_session(self) -> ClientSession:
+        """Returns the shared session, creating it if it doesn't exist yet"""
+        if not self._session or self._session.closed:
+            self._session = ClientSession(connector=TCPConnector(limit=20, keepalive_timeout=60), headers={"X-Riot-Token": RIOT_API_KEY},
+                                          timeout=ClientTimeout(total=RIOT_REQUEST_TIMEOUT))
+        return self._session
+
+    async def close(self) -> None:
+        """
+        Closes the shared session, match cache and sync marks, they will be reopened if another call is made
+
+        Returns:
+            None
+        """
+        if self._session:
+            await self._session.close()
+            self._session = None
+        self._match_cache.close()
+        self._sync_marks.close()
+
+    async def _cached_get(self, kind: str, key, method: str, url: str):
+        """Makes the request unless a response for the key is in the kind's cache, caching it for RIOT_CACHE_TTLS[kind] seconds"""
+        response = self._lookup_caches[kind].get(key)
+        if response is None:
+            response = await self.get(method, url)
+            self._lookup_caches[kind].set(key, response)
+        return response
+
+    async def get(self, method: str, url: str, params: dict=None):
+        """
+        Makes a GET request to the riot api, waiting for room in the region's app limit and the method's limit first
+
+        Args:
+            method (str): The riot method being called ex. match-v5.getMatch, each one has its own rate limit
+            url (str): The url to make the request
+            params (dict): The query parameters, ones that are None are left out
+
+        Returns:
+            The jsonified response
+
+        Raises:
+            CryoBotError: If the request fails, including connection errors and timeouts once they've been retried RIOT_MAX_RETRIES times
+        """
+        region = urlparse(url).hostname.split(".")[0]
+        if region not in self._app_limits:
+            self._app_limits[region] = WindowRateLimit(RIOT_APP_RATE_LIMIT)
+        if (region, method) not in self._method_limits:
+            self._method_limits[region, method] = WindowRateLimit()
+        app_limit = self._app_limits[region]
+        method_limit = self._method_limits[region, method]
+        params = {key: value for key, value in (params or {}).items() if value is not None}
+
+        attempt = 0
+        while True:
+            await method_limit.acquire()
+            await app_limit.acquire()
+            try:
+                async with self._get_session().get(url, params=params) as response:
+                    app_limit.update(response.headers.get("X-App-Rate-Limit"), response.headers.get("X-App-Rate-Limit-Count"))
+                    method_limit.update(response.headers.get("X-Method-Rate-Limit"), response.headers.get("X-Method-Rate-Limit-Count"))
+                    if response.status == 200:
+                        return await response.json(content_type=None)
+                    if response.status not in RiotAPI.retryCodes or attempt >= RIOT_MAX_RETRIES:
+                        debugPrint(f"Riot API Error: {response.status}")
+                        raise CryoBotError(ErrorName.RIOT_FAILED, f"method='{method}', url='{url}', status_code={response.status}")
+                    retry_after = parse_retry_after(response.headers.get("Retry-After"), .5 * 2 ** attempt)
+                    limit_type = response.headers.get("X-Rate-Limit-Type") if response.status == 429 else None
+                    reason = response.status
+            except (ClientError, asyncio.TimeoutError) as e:
+                if attempt >= RIOT_MAX_RETRIES:
+                    debugPrint(f"Riot API Error: {e!r}")
+                    raise CryoBotError(ErrorName.RIOT_FAILED, f"method='{method}', url='{url}', error={e!r}")
+                retry_after, limit_type, reason = .5 * 2 ** attempt, None, type(e).__name__
+            attempt += 1
+            debugPrint(f"Riot API {reason}, Retrying In {retry_after}s: method='{method}'")
+            # The limit that was hit makes everyone sharing it wait, anything else only delays this request
+            if limit_type == "application":
+                app_limit.pause(retry_after)
+            elif limit_type == "method":
+                method_limit.pause(retry_after)
             else:
-                debugPrint("Riot API Error: ", rtn['status']['status_code'])
-                # raise Exception("ERRRORR: ", rtn['status']['status_code'])
-        return rtn
+                await asyncio.sleep(retry_after)
 
     # AccountDTO
-    @staticmethod
-    def getAccount(self, gameName, tagline):
+    async def getAccount(self, gameName, tagline):
         '''AccountDTO'''
-        url = f'https://americas.api.riotgames.com/riot/account/v1/accounts/by-riot-id/{gameName}/{tagline}'
-        params = RiotAPI.param.copy()
-        return RiotAPI.get(url, params)
+        return await self._cached_get("account", (gameName.casefold(), tagline.casefold()), "account-v1.getByRiotId",
+                                      f'https://americas.api.riotgames.com/riot/account/v1/accounts/by-riot-id/{gameName}/{tagline}')
 
     # SummonerDTO
-    @staticmethod
-    def getSummoner(self, summonerId):
+    async def getSummoner(self, summonerId):
         '''SummonerDTO'''
-        url = f'https://na1.api.riotgames.com/lol/summoner/v4/summoners/{summonerId}'
-        params = RiotAPI.param.copy()
-        return RiotAPI.get(url, params)
+        return await self._cached_get("summoner", summonerId, "summoner-v4.getBySummonerId",
+                                      f'https://na1.api.riotgames.com/lol/summoner/v4/summoners/{summonerId}')
 
     # List[Entry]
-    @staticmethod
-    def getGameEntries(puuid, queue=None, count=20, start=0):
+    async def getGameEntries(self, puuid, queue=None, count=20, start=0, startTime=None):
         '''List[Entry]'''
         url = f'https://americas.api.riotgames.com/lol/match/v5/matches/by-puuid/{puuid}/ids'
-        params = RiotAPI.param.copy()
-        params['queue'] = queue
-        params['count'] = count
-        params['start'] = start
-        return RiotAPI.get(url, params)
+        params = {'queue': queue, 'count': count, 'start': start, 'startTime': startTime}
+        return await self.get("match-v5.getMatchIdsByPUUID", url, params)
+
+    # (List[Entry], (str, float))
+    async def syncGameEntries(self, puuid, queue=None, count=100):
+        '''
+        Returns the player's match ids that are newer than the last sync, newest first, and the mark to commit once they're handled
+
+        Riot is only asked for games since the last sync (less RIOT_SYNC_OVERLAP) and paging goes until the last synced match,
+        so a player with no new games costs a single call. A player that was never synced gets their latest count matches.
+        The mark isn't moved here, pass it to commitSyncMark after every returned match has been fetched so none are skipped
+
+        Args:
+            puuid (str): The player's puuid
+            queue (int): The queue id to filter matches by, None for every queue
+            count (int): The most match ids to return for a player that was never synced
+
+        Returns:
+            (List[Entry], (str, float)): The new match ids and the mark after them, None if the player has no games to mark
+
+        Raises:
+            CryoBotError: If a request fails
+        '''
+        mark = self._sync_marks.get(puuid, queue)
+        last_match_id, start_time = (mark[0], int(mark[1]) - RIOT_SYNC_OVERLAP) if mark else (None, None)
+        synced = time.time()
+        match_ids = []
+        while mark or len(match_ids) < count:
+            page_size = 100 if mark else min(count - len(match_ids), 100)
+            page = await self.getGameEntries(puuid, queue, page_size, len(match_ids), start_time)
+            if last_match_id in page:
+                match_ids += page[:page.index(last_match_id)]
+                break
+            match_ids += page
+            if len(page) < page_size:
+                break
+
+        if match_ids:
+            return match_ids, (match_ids[0], synced)
+        return match_ids, (last_match_id, synced) if mark else None
+
+    # None
+    def commitSyncMark(self, puuid, queue, mark):
+        '''Moves the player's mark to one returned by syncGameEntries, does nothing if it's None'''
+        if mark:
+            self._sync_marks.set(puuid, queue, *mark)
 
     # Entry
-    @staticmethod
-    def getLatestEntry(puuid, queue):
+    async def getLatestEntry(self, puuid, queue):
         '''Entry'''
-        url = f'https://americas.api.riotgames.com/lol/match/v5/matches/by-puuid/{puuid}/ids'
-        params = RiotAPI.param.copy()
-        params['queue'] = queue
-        params['count'] = 1
-        params['start'] = 0
-        rtn = RiotAPI.get(url, params)
+        rtn = await self.getGameEntries(puuid, queue, count=1)
         if len(rtn):
             return rtn[0]
         return None
 
     # MatchDTO
-    @staticmethod
-    def getMatch(matchId):
-        '''MatchDTO'''
-        url = f'https://americas.api.riotgames.com/lol/match/v5/matches/{matchId}'
-        params = RiotAPI.param.copy()
-        return RiotAPI.get(url, params)
+    async def getMatch(self, matchId):
+        '''MatchDTO, read through the match cache since a match never changes once it's over'''
+        match = self._match_cache.get(matchId)
+        if match is None:
+            url = f'https://americas.api.riotgames.com/lol/match/v5/matches/{matchId}'
+            match = await self.get("match-v5.getMatch", url)
+            self._match_cache.set(matchId, match)
+        return match
+
+    # AsyncIterator[RosterMatch]
+    async def getRosterMatches(self, team: Team, queue=None, count=20, incremental=False) -> AsyncIterator[RosterMatch]:
+        '''
+        Streams the recent matches of every player on the team's roster as they arrive
+
+        Each player's match ids are paged lazily while up to RIOT_MATCH_CONCURRENCY matches are fetched at once under the rate limits,
+        and games the players shared are only fetched and yielded once. Stopping early cancels everything still in progress.
+        When incremental, a player's mark is only moved once every one of their new matches has been yielded,
+        so matches that failed or were never consumed are picked up again by the next sync
+
+        Args:
+            team (Team): The team whose roster to fetch, players without a puuid are skipped
+            queue (int): The queue id to filter matches by, None for every queue
+            count (int): How many of each player's most recent matches to fetch, only for players never synced when incremental
+            incremental (bool): Whether to only fetch matches since each player's last sync, see syncGameEntries
+
+        Returns:
+            AsyncIterator[RosterMatch]: The matches in the order they finish fetching
+
+        Raises:
+            CryoBotError: If a request fails
+        '''
+        puuids = {player.puuid for player in team.roster if player.puuid}
+        seen: set[str] = set()
+        match_ids: asyncio.Queue[str] = asyncio.Queue()
+        results: asyncio.Queue[tuple[str, dict | Exception]] = asyncio.Queue()
+        yielded: set[str] = set()
+        marks: dict[str, tuple[str, float]] = {}
+        unyielded: dict[str, set[str]] = {}
+        listed_by: dict[str, list[str]] = {}
+
+        def commit_if_done(puuid: str):
+            if puuid in marks and not unyielded[puuid]:
+                self.commitSyncMark(puuid, queue, marks.pop(puuid))
+
+        async def page_match_ids(puuid: str):
+            if incremental:
+                new_match_ids, mark = await self.syncGameEntries(puuid, queue, count)
+                unyielded[puuid] = set()
+                for match_id in new_match_ids:
+                    if match_id not in yielded:
+                        unyielded[puuid].add(match_id)
+                        listed_by.setdefault(match_id, []).append(puuid)
+                    if match_id not in seen:
+                        seen.add(match_id)
+                        match_ids.put_nowait(match_id)
+                marks[puuid] = mark
+                commit_if_done(puuid)
+                return
+            start = 0
+            while start < count:
+                page_size = min(count - start, 100)
+                page = await self.getGameEntries(puuid, queue, page_size, start)
+                for match_id in page:
+                    if match_id not in seen:
+                        seen.add(match_id)
+                        match_ids.put_nowait(match_id)
+                if len(page) < page_size:
+                    break
+                start += page_size
+
+        async def fetch_matches():
+            while True:
+                match_id = await match_ids.get()
+                try: results.put_nowait((match_id, await self.getMatch(match_id)))
+                except Exception as e: results.put_nowait((match_id, e))
+                finally: match_ids.task_done()
+
+        async def feed(pagers: list[asyncio.Task]):
+            try: await asyncio.gather(*pagers)
+            except Exception as e: results.put_nowait((None, e))
+            await match_ids.join()
+            results.put_nowait((None, None))
+
+        # Every player's paging is its own task so stopping early or a failure cancels all of them, gather alone wouldn't
+        pagers = [asyncio.create_task(page_match_ids(puuid)) for puuid in puuids]
+        tasks = pagers + [asyncio.create_task(feed(pagers))] + [asyncio.create_task(fetch_matches()) for _ in range(RIOT_MATCH_CONCURRENCY)]
+        try:
+            while True:
+                match_id, match = await results.get()
+                if isinstance(match, Exception):
+                    raise match
+                if match is None:
+                    return
+                yield RosterMatch(match_id, match, [puuid for puuid in match["metadata"]["participants"] if puuid in puuids])
+                yielded.add(match_id)
+                for puuid in listed_by.pop(match_id, []):
+                    unyielded[puuid].discard(match_id)
+                    commit_if_done(puuid)
+        finally:
+            for task in tasks:
+                task.cancel()
 
     # Set(LeagueEntryDTO)
-    @staticmethod
-    def getLeagueEntries(puuid):
+    async def getLeagueEntries(self, puuid):
         '''Set(LeagueEntryDTO)'''
-        url = f'https://na1.api.riotgames.com/lol/league/v4/entries/by-puuid/{puuid}'
-        params = RiotAPI.param.copy()
-        return RiotAPI.get(url, params)
+        return await self._cached_get("league", puuid, "league-v4.getLeagueEntriesByPUUID",
+                                      f'https://na1.api.riotgames.com/lol/league/v4/entries/by-puuid/{puuid}')
 
     # (Tier, Rank, LP)
-    @staticmethod
-    def getRank(puuid, queue):
+    async def getRank(self, puuid, queue):
         '''(Tier, Rank, LP)'''
-        for entry in RiotAPI.getLeagueEntries(puuid):
+        for entry in await self.getLeagueEntries(puuid):
             if entry["queueType"] == queue:
                 return (entry["tier"], entry["rank"], entry["leaguePoints"])
-        return None
\ No newline at end of file
+        return None
+
+    # {puuid: (Tier, Rank, LP)}
+    async def getRanks(self, puuids, queue):
+        '''
+        Gets the rank of every player at once, cached league entries are used and only the misses are fetched, concurrently
+
+        Args:
+            puuids (list[str]): The players' puuids
+            queue (str): The queue type to get the rank for ex. RANKED_SOLO_5x5
+
+        Returns:
+            dict[str, tuple]: Each puuid's (Tier, Rank, LP), None for players unranked in the queue
+
+        Raises:
+            CryoBotError: If a request fails
+        '''
+        misses = {puuid for puuid in puuids if self._lookup_caches["league"].get(puuid) is None}
+        await asyncio.gather(*(self.getLeagueEntries(puuid) for puuid in misses))
+        return {puuid: await self.getRank(puuid, queue) for puuid in puuids}
@@ -246,6 +246,11 @@ class Scrim:
     def __hash__(self):
         return hash((self.time, self.scrim_format))
 
+    def request_key(self) -> tuple:
+        """Returns a hashable identity for a scrim request, requests with equal keys are treated as the same request"""
+        team = (self.team.number or self.team.name) if self.team else None
+        return (self.gankster_id, self.time, self.scrim_format, team, self.open)
+
     def __str__(self):
         return f"<Scrim: time='{self.time.strftime('%m/%d/%y %I:%M %p')}', format='{self.scrim_format.format_short}', team={str(self.team)}, open={self.open}>"
 
@@ -268,6 +273,20 @@ class Scrim:
     def timestamp_to_datetime(timestamp: int):
         return datetime.fromtimestamp(timestamp / 1000)
 
+@dataclass
+class ScrimChats:
+    """Class representing a single retrieval of Cryobark's Gankster scrim chats"""
+    incoming_requests: list[Scrim]
+    outgoing_requests: list[Scrim]
+    booked_scrims: list[Scrim]
+
+@dataclass
+class RosterMatch:
+    """Class representing a riot match played by at least one player on a roster"""
+    match_id: str
+    match: dict # MatchDTO
+    puuids: list[str] # The roster players that played in the match
+
 class ErrorName(Enum):
     """Enum representing each possible CryoBarkError"""
     NONE = "None"
@@ -321,6 +340,7 @@ class ErrorName(Enum):
     INVALID_TEAM = "InvalidTeam"
     INVALID_PLAYER = "InvalidPlayer"
     TEAM_NOT_FOUND = "TeamNotFound"
+    RIOT_FAILED = "RiotFailed"
 
 ERROR_DESCRIPTIONS = {
     ErrorName.NONE: "No Issue",
@@ -373,7 +393,8 @@ ERROR_DESCRIPTIONS = {
     ErrorName.GANKSTER_FAILED: "The given function's success condition failed to be met",
     ErrorName.INVALID_TEAM: "The team stats could not be found for the given team, number or name required",
     ErrorName.INVALID_PLAYER: "The player stats could not be found for the given player, puuid required",
-    ErrorName.TEAM_NOT_FOUND: "No team was found with the given name after searching gankster"
+    ErrorName.TEAM_NOT_FOUND: "No team was found with the given name after searching gankster",
+    ErrorName.RIOT_FAILED: "The riot api request failed or was rate limited too many times"
 }
 
 @dataclass
@@ -0,0 +1,80 @@
+import discord
+
+from scrim_classes import Scrim
+from send_queue import QueuedMessage, SendPriority, SendQueue
+
+class ScrimMessages:
+    """
+    Tracks the discord message posted for each of Cryobark's scrims
+
+    A scrim's message is edited in place when it changes, and only deleted and sent again when a new ping is needed,
+    which is whenever the scrim switches between open (pings managers) and booked (pings the team) or the caller asks for one
+    Everything goes through a SendQueue so posting never waits on discord
+    """
+    def __init__(self):
+        self._queue: SendQueue = None
+        self._messages: dict[Scrim, tuple[Scrim, QueuedMessage]] = {}
+
+    def set_queue(self, queue: SendQueue) -> None:
+        """Sets the queue for the channel messages are posted in, must be called before anything is posted"""
+        self._queue = queue
+
+    def restore(self, scrim: Scrim, message: discord.Message | discord.PartialMessage) -> None:
+        """Starts tracking an already posted message for the given scrim, used when loading saved state"""
+        self._messages[scrim] = (scrim, QueuedMessage(message))
+
+    def message_id(self, scrim: Scrim) -> int:
+        """Returns the id of the given scrim's message, None if it doesn't have one or it hasn't been sent yet"""
+        return self._messages[scrim][1].id if scrim in self._messages else None
+
+    def move(self, old_scrim: Scrim, new_scrim: Scrim) -> None:
+        """Moves the old scrim's message to the new scrim without changing it"""
+        if old_scrim in self._messages:
+            self._messages[new_scrim] = self._messages.pop(old_scrim)
+
+    def __contains__(self, scrim: Scrim) -> bool:
+        return scrim in self._messages
+
+    def post(self, scrim: Scrim, content: str, embed: discord.Embed, old_scrim: Scrim=None, ping: bool=False) -> None:
+        """
+        Queues the embed for the given scrim, editing its existing message if no new ping is needed
+
+        Args:
+            scrim (Scrim): The scrim to post the embed for
+            content (str): The message content, usually the role to ping
+            embed (discord.Embed): The embed to post
+            old_scrim (Scrim): The scrim's previous version if it was updated, its message is reused
+            ping (bool): Whether to always send a new message so content pings again
+
+        Returns:
+            None
+        """
+        previous_scrim, message = self._messages.pop(scrim if old_scrim is None else old_scrim, (None, None))
+        resend = not message or ping or previous_scrim.open != scrim.open
+        self._messages[scrim] = (scrim, self._queue.post(content, embed, message, resend, SendPriority.PING if resend else SendPriority.INFO))
+
+    def remove(self, scrim: Scrim) -> None:
+        """
+        Queues deleting the given scrim's message and stops tracking it
+
+        Args:
+            scrim (Scrim): The scrim whose message should be deleted
+
+        Returns:
+            None
+        """
+        if scrim in self._messages:
+            self._queue.delete(self._messages.pop(scrim)[1])
+
+    def send(self, content: str, embed: discord.Embed) -> None:
+        """
+        Queues a message that isn't tracked for any scrim, like a cancellation or played announcement
+
+        Args:
+            content (str): The message content, None for no content
+            embed (discord.Embed): The embed to send
+
+        Returns:
+            None
+        """
+        self._queue.send(content, embed, SendPriority.PING if content else SendPriority.INFO)
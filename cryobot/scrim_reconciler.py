@@ -0,0 +1,153 @@
+from collections import defaultdict
+from dataclasses import dataclass, replace
+from datetime import datetime
+from enum import Enum
+
+from helper import getVariable
+from scrim_classes import Scrim, Team
+
+WILDCARD_TEAM: Team = getVariable("WILDCARD_TEAM")
+
+class ScrimTransitionType(Enum):
+    """Enum representing each way one of Cryobark's scrims can change between two retrievals"""
+    CREATED = "Created"
+    BOOKED = "Booked"
+    WILDCARD_BOOKED = "WildcardBooked"
+    RESENT = "Resent"
+    FOUND_CANCELLED = "FoundCancelled"
+    CREATED_CANCELLED = "CreatedCancelled"
+    UPDATED = "Updated"
+    UPDATED_BOOKED = "UpdatedBooked"
+    WILDCARD_UPDATED_BOOKED = "WildcardUpdatedBooked"
+    BOOKED_UPDATED = "BookedUpdated"
+    WILDCARD_BOOKED_UPDATED = "WildcardBookedUpdated"
+    PASSED = "Passed"
+    PLAYED = "Played"
+
+@dataclass
+class ScrimTransition:
+    """Class representing a single change to one of Cryobark's scrims, old_scrim is only set for updates"""
+    type: ScrimTransitionType
+    scrim: Scrim
+    old_scrim: Scrim = None
+
+@dataclass
+class ScrimReconciliation:
+    """Class representing the new state of Cryobark's scrims and the transitions that got it there"""
+    current_scrims: set[Scrim]
+    played_scrims: set[Scrim]
+    transitions: list[ScrimTransition]
+
+def reconcile_scrims(current_scrims: set[Scrim], played_scrims: set[Scrim], new_scrims: list[Scrim], now: datetime) -> ScrimReconciliation:
+    """
+    Compares the scrims being tracked against the newly retrieved scrims and determines what changed
+
+    Scrims are matched by time and format first, then an unmatched scrim is treated as updated if it shares a
+    gankster_id or start time with a tracked scrim that is gone. Everything is indexed so this is linear in the number of scrims.
+    Nothing passed in is modified.
+
+    Args:
+        current_scrims (set[Scrim]): The scrims currently being tracked
+        played_scrims (set[Scrim]): The booked scrims that are being played and waiting to finish
+        new_scrims (list[Scrim]): Cryobark's newly retrieved outgoing scrims
+        now (datetime): The current time
+
+    Returns:
+        ScrimReconciliation: The new current and played scrims, and the transitions in the order they should be handled
+    """
+    current: dict[Scrim, Scrim] = {scrim: scrim for scrim in current_scrims}
+    played = set(played_scrims)
+    transitions: list[ScrimTransition] = []
+
+    # Scrims gankster no longer shows, booked ones are being played and open ones were never booked
+    for scrim in list(current):
+        if scrim.get_gankster_removal_time() < now:
+            del current[scrim]
+            if scrim.open:
+                transitions.append(ScrimTransition(ScrimTransitionType.PASSED, scrim))
+            else:
+                played.add(scrim)
+
+    for scrim in list(played):
+        if scrim.get_scrim_end_time() < now:
+            played.remove(scrim)
+            transitions.append(ScrimTransition(ScrimTransitionType.PLAYED, scrim))
+
+    new_scrims = [scrim for scrim in new_scrims if scrim.get_gankster_removal_time() >= now]
+    new_scrim_set = set(new_scrims)
+
+    # Tracked scrims with no exact match are either updated or cancelled
+    unmatched_by_id: dict[int, Scrim] = {}
+    unmatched_by_time: dict[datetime, list[Scrim]] = defaultdict(list)
+    for scrim in current.values():
+        if scrim not in new_scrim_set:
+            if scrim.gankster_id:
+                unmatched_by_id[scrim.gankster_id] = scrim
+            unmatched_by_time[scrim.time].append(scrim)
+
+    def take_unmatched(new_scrim: Scrim) -> Scrim:
+        old_scrim = unmatched_by_id.get(new_scrim.gankster_id) if new_scrim.gankster_id else None
+        if old_scrim is None and unmatched_by_time[new_scrim.time]:
+            old_scrim = unmatched_by_time[new_scrim.time][0]
+        if old_scrim is not None:
+            if unmatched_by_id.get(old_scrim.gankster_id) is old_scrim:
+                del unmatched_by_id[old_scrim.gankster_id]
+            unmatched_by_time[old_scrim.time].remove(old_scrim)
+            del current[old_scrim]
+        return old_scrim
+
+    def booked(scrim: Scrim) -> ScrimTransition:
+        if scrim.team == WILDCARD_TEAM:
+            return ScrimTransition(ScrimTransitionType.WILDCARD_BOOKED, scrim)
+        return ScrimTransition(ScrimTransitionType.BOOKED, scrim)
+
+    for new_scrim in new_scrims:
+        old_scrim = current.get(new_scrim)
+        if old_scrim is not None:
+            if new_scrim.open != old_scrim.open:
+                del current[old_scrim]
+                current[new_scrim] = new_scrim
+                if new_scrim.open:
+                    transitions.append(ScrimTransition(ScrimTransitionType.FOUND_CANCELLED, old_scrim))
+                    transitions.append(ScrimTransition(ScrimTransitionType.RESENT, new_scrim))
+                else:
+                    transitions.append(booked(new_scrim))
+            elif new_scrim.team != old_scrim.team:
+                del current[old_scrim]
+                current[new_scrim] = new_scrim
+                if old_scrim.team != WILDCARD_TEAM:
+                    transitions.append(ScrimTransition(ScrimTransitionType.FOUND_CANCELLED, old_scrim))
+                transitions.append(ScrimTransition(ScrimTransitionType.BOOKED, new_scrim))
+            continue
+
+        old_scrim = take_unmatched(new_scrim)
+        if old_scrim is None:
+            current[new_scrim] = new_scrim
+            transitions.append(ScrimTransition(ScrimTransitionType.CREATED, new_scrim) if new_scrim.open else booked(new_scrim))
+            continue
+
+        if new_scrim.team == WILDCARD_TEAM and old_scrim.team:
+            new_scrim = replace(new_scrim, team=old_scrim.team)
+        current[new_scrim] = new_scrim
+        if (new_scrim.team == old_scrim.team or old_scrim.team == WILDCARD_TEAM) and new_scrim.team:
+            if new_scrim.team == WILDCARD_TEAM:
+                transitions.append(ScrimTransition(ScrimTransitionType.WILDCARD_BOOKED_UPDATED, new_scrim, old_scrim))
+            else:
+                transitions.append(ScrimTransition(ScrimTransitionType.BOOKED_UPDATED, new_scrim, old_scrim))
+        elif new_scrim.open and old_scrim.open:
+            transitions.append(ScrimTransition(ScrimTransitionType.UPDATED, new_scrim, old_scrim))
+        elif new_scrim.open:
+            transitions.append(ScrimTransition(ScrimTransitionType.FOUND_CANCELLED, old_scrim))
+            transitions.append(ScrimTransition(ScrimTransitionType.RESENT, new_scrim))
+        elif new_scrim.team == WILDCARD_TEAM:
+            transitions.append(ScrimTransition(ScrimTransitionType.WILDCARD_UPDATED_BOOKED, new_scrim, old_scrim))
+        else:
+            transitions.append(ScrimTransition(ScrimTransitionType.UPDATED_BOOKED, new_scrim, old_scrim))
+
+    # Whatever is left unmatched was withdrawn
+    for old_scrims in unmatched_by_time.values():
+        for old_scrim in old_scrims:
+            del current[old_scrim]
+            transitions.append(ScrimTransition(ScrimTransitionType.CREATED_CANCELLED, old_scrim))
+
+    return ScrimReconciliation(set(current), played, transitions)
@@ -0,0 +1,172 @@
+import asyncio
+import heapq
+import itertools
+from enum import IntEnum
+from typing import Awaitable, Callable
+
+import discord
+
+from helper import debugPrint
+
+MAX_EMBEDS_PER_MESSAGE = 10
+MAX_EMBED_CHARACTERS = 6000
+
+class SendPriority(IntEnum):
+    """Enum representing the order queued discord messages go out in, lower goes first"""
+    ERROR = 0
+    PING = 1
+    INFO = 2
+
+class QueuedMessage:
+    """Handle to a message posted through a SendQueue, message stays None until its send goes through"""
+    def __init__(self, message: discord.Message | discord.PartialMessage=None):
+        self.message: discord.Message | discord.PartialMessage = message
+
+    @property
+    def id(self) -> int:
+        return self.message.id if self.message else None
+
+class _Batch:
+    """Untracked embeds waiting to go out together in a single message"""
+    def __init__(self, content: str, embed: discord.Embed):
+        self.content: str = content
+        self.embeds: list[discord.Embed] = [embed] if embed else []
+
+    def add(self, embed: discord.Embed) -> bool:
+        """Adds the embed if discord's limits allow it, returning whether it was added"""
+        if not embed or len(self.embeds) >= MAX_EMBEDS_PER_MESSAGE or sum(map(len, self.embeds)) + len(embed) > MAX_EMBED_CHARACTERS:
+            return False
+        self.embeds.append(embed)
+        return True
+
+class SendQueue:
+    """
+    Outbound queue for a single discord channel, drained in the background so callers never wait on discord
+
+    Messages go out one at a time in priority order (errors, then pings, then informational embeds) so a burst doesn't
+    pile up behind discord.py's per channel rate limit. Everything done to one tracked message keeps the order it was queued in,
+    and untracked embeds with the same content and priority are batched into as few messages as possible.
+    """
+    def __init__(self, channel: discord.abc.Messageable, on_error: Callable[[Exception], None]=None, on_idle: Callable[[], None]=None):
+        self._channel = channel
+        self._on_error = on_error
+        self._on_idle = on_idle
+        self._heap: list[tuple[SendPriority, int, QueuedMessage, Callable[[], Awaitable[None]]]] = []
+        self._order = itertools.count()
+        self._pending: dict[QueuedMessage, tuple[SendPriority, int]] = {}
+        self._batches: dict[tuple[SendPriority, str], _Batch] = {}
+        self._drainer: asyncio.Task = None
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def _submit(self, job: Callable[[], Awaitable[None]], priority: SendPriority, queued_message: QueuedMessage=None) -> None:
+        """Queues the job, never letting it jump ahead of something queued earlier for the same message"""
+        if queued_message is not None:
+            pending_priority, count = self._pending.get(queued_message, (priority, 0))
+            priority = max(priority, pending_priority)
+            self._pending[queued_message] = (priority, count + 1)
+        heapq.heappush(self._heap, (priority, next(self._order), queued_message, job))
+        if not self._drainer or self._drainer.done():
+            self._drainer = asyncio.create_task(self._drain())
+
+    async def _drain(self) -> None:
+        """Runs queued jobs until the queue is empty"""
+        while self._heap:
+            _, _, queued_message, job = heapq.heappop(self._heap)
+            try:
+                await job()
+            except Exception as e:
+                debugPrint(f"Failed To Send To Discord: {e}")
+                if self._on_error:
+                    try: self._on_error(e)
+                    except Exception as e: debugPrint(f"Failed To Report Discord Send Error: {e}")
+            if queued_message is not None:
+                priority, count = self._pending.pop(queued_message)
+                if count > 1:
+                    self._pending[queued_message] = (priority, count - 1)
+        if self._on_idle:
+            try: self._on_idle()
+            except Exception as e: debugPrint(f"Failed To Run Send Queue Idle Callback: {e}")
+
+    def send(self, content: str, embed: discord.Embed=None, priority: SendPriority=SendPriority.INFO) -> None:
+        """
+        Queues a message that won't be edited or deleted later, batching its embed with others like it
+
+        Args:
+            content (str): The message content, None for no content
+            embed (discord.Embed): The embed to send, None for no embed
+            priority (SendPriority): How soon the message should go out
+
+        Returns:
+            None
+        """
+        batch = self._batches.get((priority, content))
+        if batch and batch.add(embed):
+            return
+        batch = _Batch(content, embed)
+        self._batches[(priority, content)] = batch
+
+        async def send_batch():
+            if self._batches.get((priority, content)) is batch:
+                self._batches.pop((priority, content))
+            await self._channel.send(content, embeds=batch.embeds)
+        self._submit(send_batch, priority)
+
+    def post(self, content: str, embed: discord.Embed, queued_message: QueuedMessage=None, resend: bool=True,
+             priority: SendPriority=SendPriority.INFO) -> QueuedMessage:
+        """
+        Queues posting a message that can be edited or deleted later
+
+        Args:
+            content (str): The message content
+            embed (discord.Embed): The embed to post
+            queued_message (QueuedMessage): The message to replace, None to post a new one
+            resend (bool): Whether to delete the message and send a new one so content pings again, instead of editing it
+            priority (SendPriority): How soon the message should go out
+
+        Returns:
+            QueuedMessage: The handle to the message, the same one passed in if there was one
+        """
+        queued_message = queued_message or QueuedMessage()
+
+        async def post():
+            if queued_message.message and not resend:
+                try:
+                    queued_message.message = await queued_message.message.edit(content=content, embed=embed) or queued_message.message
+                    return
+                except discord.NotFound:
+                    queued_message.message = None
+            if queued_message.message:
+                try: await queued_message.message.delete()
+                except discord.NotFound: pass
+            queued_message.message = await self._channel.send(content, embed=embed)
+        self._submit(post, priority, queued_message)
+        return queued_message
+
+    def delete(self, queued_message: QueuedMessage) -> None:
+        """
+        Queues deleting a message posted through the queue, after anything already queued for it
+
+        Args:
+            queued_message (QueuedMessage): The message to delete
+
+        Returns:
+            None
+        """
+        async def delete():
+            if queued_message.message:
+                try: await queued_message.message.delete()
+                except discord.NotFound: pass
+                queued_message.message = None
+        self._submit(delete, SendPriority.INFO, queued_message)
+
+    async def join(self) -> None:
+        """
+        Waits until everything queued so far has been sent
+
+        Returns:
+            None
+        """
+        while self._drainer and not self._drainer.done():
+            await asyncio.wait([self._drainer])
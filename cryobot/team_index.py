@@ -0,0 +1,68 @@
+import sqlite3
+import time
+
+from helper import getVariable, normalizeTeamName
+
+DATABASE_FILE: str = getVariable("DATABASE_FILE")
+
+class TeamIndex:
+    """
+    Persistent index of normalized team names to gankster team numbers, stored in DATABASE_FILE
+
+    Names are never removed when a team renames itself, so old names keep working as aliases
+    The whole index is kept in memory after the first lookup so resolving a name doesn't touch the disk
+    """
+    def __init__(self, path: str=DATABASE_FILE):
+        self._path: str = path
+        self._connection: sqlite3.Connection = None
+        self._numbers: dict[str, int] = {}
+
+    def _connect(self) -> sqlite3.Connection:
+        """Opens the database and loads the index into memory if it hasn't been yet"""
+        if not self._connection:
+            self._connection = sqlite3.connect(self._path)
+            self._connection.execute("CREATE TABLE IF NOT EXISTS team_names (name TEXT PRIMARY KEY, number INTEGER NOT NULL, updated REAL NOT NULL)")
+            self._numbers = dict(self._connection.execute("SELECT name, number FROM team_names"))
+        return self._connection
+
+    def get(self, team_name: str) -> int:
+        """
+        Gets the team number for the given team name or alias
+
+        Args:
+            team_name (str): The team name or alias to look up
+
+        Returns:
+            int: The team's number, 0 if the name isn't indexed
+        """
+        self._connect()
+        return self._numbers.get(normalizeTeamName(team_name), 0)
+
+    def add(self, team_number: int, *team_names: str) -> None:
+        """
+        Indexes the given names and aliases to the given team number, only writing to disk if something changed
+
+        Args:
+            team_number (int): The gankster team number
+            team_names (str): The names and aliases of the team
+
+        Returns:
+            None
+        """
+        if not team_number:
+            return
+        connection = self._connect()
+        changed = [name for name in map(normalizeTeamName, team_names) if name and self._numbers.get(name) != team_number]
+        if not changed:
+            return
+        with connection:
+            connection.executemany("INSERT OR REPLACE INTO team_names (name, number, updated) VALUES (?, ?, ?)",
+                                   [(name, team_number, time.time()) for name in changed])
+        for name in changed:
+            self._numbers[name] = team_number
+
+    def close(self) -> None:
+        """Closes the database connection, it will be reopened if the index is used again"""
+        if self._connection:
+            self._connection.close()
+            self._connection = None
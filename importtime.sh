@@ -0,0 +1,9 @@
+#!/bin/bash
+# Lists the slowest imports when starting the bot, pass a number to show more or less than 25
+cd "$(dirname "$0")"
+if [ -f venv/bin/activate ]; then
+    source venv/bin/activate
+fi
+cd cryobot
+python3 -X importtime -c "import cryobot" 2> ../importtime.log
+sort -t '|' -k 2 -n -r ../importtime.log | head -n "${1:-25}"